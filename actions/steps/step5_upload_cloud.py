@@ -1,11 +1,15 @@
 """Step 5: Upload results to cloud storage."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from src.factset_report_analyzer.utils import upload_to_cloud
 from src.factset_report_analyzer.utils.cloudflare import write_csv_to_cloud
 import pandas as pd
 
+# Maximum concurrent PDF/PNG uploads (each upload is bound by network latency)
+UPLOAD_MAX_WORKERS = 8
+
 
 def upload_results_to_cloud(
     pdf_files: list[Path],
@@ -28,8 +32,11 @@ def upload_results_to_cloud(
     print("-" * 80)
     print(" ☁️  Step 5: Uploading results to cloud...")
     
-    failed_pdfs = [p.name for p in pdf_files if not upload_to_cloud(p, f"reports/{p.name}")]
-    failed_pngs = [p.name for p in chart_files if not upload_to_cloud(p, f"estimates/{p.name}")]
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        pdf_uploads = executor.map(lambda p: upload_to_cloud(p, f"reports/{p.name}"), pdf_files)
+        png_uploads = executor.map(lambda p: upload_to_cloud(p, f"estimates/{p.name}"), chart_files)
+        failed_pdfs = [p.name for p, ok in zip(pdf_files, pdf_uploads) if not ok]
+        failed_pngs = [p.name for p, ok in zip(chart_files, png_uploads) if not ok]
     
     if failed_pdfs:
         raise Exception(f"Failed to upload PDFs: {', '.join(failed_pdfs)}")
@@ -0,0 +1,294 @@
+"""Tests for cloud CSV storage (Parquet snapshots, public URL reads)."""
+
+import io
+import sys
+import tempfile
+import urllib.error
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.factset_report_analyzer.utils import cloudflare
+from src.factset_report_analyzer.utils.csv_storage import get_last_date_from_csv
+
+
+class _FakeResponse(io.BytesIO):
+    """urlopen response with a status and headers."""
+    
+    def __init__(self, content: bytes, status: int = 200, headers: dict | None = None):
+        super().__init__(content)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _fake_urlopen(files: dict[str, bytes], requests: list, honor_range: bool = True):
+    """Build a urlopen replacement serving files by URL path (Range requests answered with 206)."""
+    def urlopen(req, timeout=None):
+        path = req.full_url.removeprefix(f"{cloudflare.R2_PUBLIC_URL}/")
+        byte_range = req.get_header('Range')
+        requests.append((path, byte_range))
+        if path not in files:
+            raise urllib.error.HTTPError(req.full_url, 404, 'Not Found', {}, None)
+        
+        content = files[path]
+        if not byte_range or not honor_range:
+            return _FakeResponse(content)
+        
+        # bytes=-<suffix> or bytes=<start>-<end>
+        first, last = byte_range.removeprefix('bytes=').split('-')
+        start = max(len(content) - int(last), 0) if not first else int(first)
+        end = len(content) - 1 if not first else min(int(last), len(content) - 1)
+        return _FakeResponse(content[start:end + 1], 206, {'Content-Range': f"bytes {start}-{end}/{len(content)}"})
+    
+    return urlopen
+
+
+@contextmanager
+def _fake_bucket(files: dict[str, bytes], fail_keys: tuple[str, ...] = (), fail_deletes: bool = False):
+    """Serve files from the public URL and write/delete them through a fake S3 client."""
+    def put_object(Bucket, Key, Body, ContentType):
+        if Key in fail_keys:
+            raise ConnectionError(f"upload of {Key} failed")
+        files[Key] = Body
+    
+    def delete_object(Bucket, Key):
+        if fail_deletes:
+            raise ConnectionError(f"delete of {Key} failed")
+        files.pop(Key, None)
+    
+    def upload_file(Filename, Bucket, Key, ExtraArgs):
+        if Key in fail_keys:
+            raise ConnectionError(f"upload of {Key} failed")
+        files[Key] = Path(Filename).read_bytes()
+    
+    client = MagicMock()
+    client.put_object.side_effect = put_object
+    client.upload_file.side_effect = upload_file
+    client.delete_object.side_effect = delete_object
+    
+    cloudflare._public_url_cache.clear()
+    cloudflare._dataframe_cache.clear()
+    with patch('urllib.request.urlopen', side_effect=_fake_urlopen(files, [])), \
+         patch.object(cloudflare, 'PUBLIC_BUCKET_ENABLED', True), \
+         patch.object(cloudflare, 'boto3', object()), \
+         patch.object(cloudflare, 'Config', object()), \
+         patch.object(cloudflare, '_get_s3_client', return_value=client):
+        yield client
+    cloudflare._public_url_cache.clear()
+    cloudflare._dataframe_cache.clear()
+
+
+def _estimates_csv(rows: int = 200, quarters: int = 4) -> bytes:
+    """Build an estimates CSV sorted by Report_Date."""
+    df = pd.DataFrame({'Report_Date': pd.date_range('2016-01-01', periods=rows, freq='7D').strftime('%Y-%m-%d')})
+    for i in range(quarters):
+        df[f"Q{i % 4 + 1}'{14 + i // 4}"] = [f"{27 + i + row / 100:.2f}" for row in range(rows)]
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def test_parquet_snapshot_reads_back_like_csv():
+    """Test that a Parquet snapshot reads back identically to its CSV (NaN stays NaN)."""
+    csv_bytes = b"Report_Date,Q1'16,Q2'16\n2016-01-01,,27.5\n2016-01-08,28.2*,27.6\n"
+    
+    # Object dtype for text columns (pandas 2.x default), where Parquet returns nulls as None
+    with pd.option_context('future.infer_string', False):
+        client = MagicMock()
+        cloudflare._put_parquet_snapshot(client, csv_bytes, 'e.parquet')
+        body = client.put_object.call_args.kwargs['Body']
+        
+        csv_df = pd.read_csv(io.BytesIO(csv_bytes))
+        parquet_df = cloudflare._read_parquet(io.BytesIO(body))
+    
+    pd.testing.assert_frame_equal(parquet_df, csv_df)
+    assert str(parquet_df.iloc[0]["Q1'16"]) == 'nan'
+
+
+def test_csv_tail_read_with_offset():
+    """Test that a 206 tail read gets the header stitched on and the cut-off first row dropped."""
+    csv_bytes = _estimates_csv()
+    full_df = pd.read_csv(io.BytesIO(csv_bytes))
+    requests = []
+    
+    with patch('urllib.request.urlopen', side_effect=_fake_urlopen({'e.csv': csv_bytes}, requests)):
+        df = cloudflare.read_csv_tail_from_cloud('e.csv', tail_bytes=300)
+    
+    assert requests == [('e.csv', 'bytes=-300'), ('e.csv', 'bytes=0-4095')]
+    assert list(df.columns) == list(full_df.columns)
+    assert 0 < len(df) < len(full_df)
+    # Only complete rows are returned, and they are the last rows of the file
+    pd.testing.assert_frame_equal(df, full_df.tail(len(df)).reset_index(drop=True))
+
+
+def test_csv_tail_read_range_ignored():
+    """Test that the whole file is parsed as is when the server ignores the Range header."""
+    csv_bytes = _estimates_csv()
+    requests = []
+    
+    with patch('urllib.request.urlopen', side_effect=_fake_urlopen({'e.csv': csv_bytes}, requests, honor_range=False)):
+        df = cloudflare.read_csv_tail_from_cloud('e.csv', tail_bytes=300)
+    
+    assert requests == [('e.csv', 'bytes=-300')]
+    pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(csv_bytes)))
+
+
+def test_csv_tail_read_long_header():
+    """Test that the tail read gives up when the header does not fit in the first 4096 bytes."""
+    csv_bytes = _estimates_csv(rows=50, quarters=800)
+    assert csv_bytes.index(b'\n') > 4096
+    
+    with patch('urllib.request.urlopen', side_effect=_fake_urlopen({'e.csv': csv_bytes}, [])):
+        assert cloudflare.read_csv_tail_from_cloud('e.csv', tail_bytes=300) is None
+
+
+def test_last_date_falls_back_to_full_read():
+    """Test get_last_date_from_csv without a sidecar: tail read first, full read if it fails."""
+    files = {'short.csv': _estimates_csv(), 'wide.csv': _estimates_csv(rows=50, quarters=800)}
+    requests = []
+    
+    cloudflare._public_url_cache.clear()
+    cloudflare._dataframe_cache.clear()
+    with patch('urllib.request.urlopen', side_effect=_fake_urlopen(files, requests)):
+        last_date = get_last_date_from_csv('short.csv', Path('short.csv'))
+        assert last_date == datetime(2019, 10, 25)
+        assert ('short.csv', None) not in requests  # no full download
+        
+        requests.clear()
+        last_date = get_last_date_from_csv('wide.csv', Path('wide.csv'))
+        assert last_date == datetime(2016, 12, 9)
+        assert ('wide.csv', None) in requests  # full download after the tail read failed
+    
+    cloudflare._public_url_cache.clear()
+    cloudflare._dataframe_cache.clear()
+
+
+def test_last_date_sidecar_follows_csv_writes():
+    """Test that every write_csv_to_cloud call updates the `.last` sidecar."""
+    files = {'e.csv': _estimates_csv(rows=10), 'e.last': b'2016-03-04'}
+    
+    with _fake_bucket(files):
+        assert get_last_date_from_csv('e.csv', Path('e.csv')) == datetime(2016, 3, 4)
+        
+        df = pd.read_csv(io.BytesIO(_estimates_csv(rows=20)))
+        assert cloudflare.write_csv_to_cloud(df, 'e.csv')
+        assert files['e.last'] == b'2016-05-13'
+        assert get_last_date_from_csv('e.csv', Path('e.csv')) == datetime(2016, 5, 13)
+
+
+def test_last_date_sidecar_deleted_when_not_written():
+    """Test that the old sidecar is deleted when the new last date cannot be stored."""
+    df = pd.read_csv(io.BytesIO(_estimates_csv(rows=20)))
+    
+    # Sidecar upload fails: readers fall back to the CSV itself
+    files = {'e.csv': _estimates_csv(rows=10), 'e.last': b'2016-03-04'}
+    with _fake_bucket(files, fail_keys=('e.last',)):
+        assert cloudflare.write_csv_to_cloud(df, 'e.csv')
+        assert 'e.last' not in files
+        assert get_last_date_from_csv('e.csv', Path('e.csv')) == datetime(2016, 5, 13)
+    
+    # Report_Date cannot be parsed
+    files = {'e.csv': _estimates_csv(rows=10), 'e.last': b'2016-03-04'}
+    with _fake_bucket(files):
+        assert cloudflare.write_csv_to_cloud(df.assign(Report_Date='unknown'), 'e.csv')
+        assert 'e.last' not in files
+    
+    # The CSV upload fails: the sidecar still matches the old CSV
+    files = {'e.csv': _estimates_csv(rows=10), 'e.last': b'2016-03-04'}
+    with _fake_bucket(files, fail_keys=('e.csv',)):
+        assert not cloudflare.write_csv_to_cloud(df, 'e.csv')
+        assert files['e.last'] == b'2016-03-04'
+
+
+def test_snapshot_never_newer_than_csv():
+    """Test that a failed CSV upload does not leave a new snapshot next to the old CSV."""
+    old_csv = _estimates_csv(rows=10)
+    df = pd.read_csv(io.BytesIO(_estimates_csv(rows=20)))
+    
+    files = {'e.csv': old_csv}
+    with _fake_bucket(files, fail_keys=('e.csv',)):
+        assert not cloudflare.write_csv_to_cloud(df, 'e.csv')
+        assert files['e.csv'] == old_csv
+        assert 'e.parquet' not in files
+        assert len(cloudflare.read_csv_from_cloud('e.csv')) == 10
+
+
+def test_snapshot_cleanup_failure_keeps_csv_write():
+    """Test that a failed snapshot cleanup does not turn a successful CSV write into a failure."""
+    df = pd.read_csv(io.BytesIO(_estimates_csv(rows=20)))
+    
+    files = {'e.csv': _estimates_csv(rows=10)}
+    with _fake_bucket(files, fail_keys=('e.parquet',), fail_deletes=True):
+        assert cloudflare.write_csv_to_cloud(df, 'e.csv')
+        assert files['e.csv'] == df.to_csv(index=False).encode('utf-8')
+
+
+def test_file_upload_refreshes_csv_companions():
+    """Test that uploading a CSV file rewrites (or deletes) its snapshot and sidecar."""
+    csv_bytes = _estimates_csv(rows=20)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / 'e.csv'
+        file_path.write_bytes(csv_bytes)
+        
+        files = {'e.csv': _estimates_csv(rows=10), 'e.parquet': b'old', 'e.last': b'2016-03-04'}
+        with _fake_bucket(files):
+            assert cloudflare.upload_file_to_public_cloud(file_path, 'e.csv')
+            assert files['e.csv'] == csv_bytes
+            assert files['e.last'] == b'2016-05-13'
+            assert len(cloudflare.read_csv_from_cloud('e.csv')) == 20
+        
+        # Companions that cannot be rewritten are deleted
+        files = {'e.csv': _estimates_csv(rows=10), 'e.parquet': b'old', 'e.last': b'2016-03-04'}
+        with _fake_bucket(files, fail_keys=('e.parquet', 'e.last')):
+            assert cloudflare.upload_file_to_public_cloud(file_path, 'e.csv')
+            assert 'e.parquet' not in files
+            assert 'e.last' not in files
+            assert len(cloudflare.read_csv_from_cloud('e.csv')) == 20
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("Cloud Storage Tests")
+    print("=" * 80)
+    
+    tests = [
+        ("Parquet snapshot reads back like CSV", test_parquet_snapshot_reads_back_like_csv),
+        ("CSV tail read with offset", test_csv_tail_read_with_offset),
+        ("CSV tail read with range ignored", test_csv_tail_read_range_ignored),
+        ("CSV tail read with long header", test_csv_tail_read_long_header),
+        ("Last date falls back to full read", test_last_date_falls_back_to_full_read),
+        ("Last date sidecar follows CSV writes", test_last_date_sidecar_follows_csv_writes),
+        ("Last date sidecar deleted when not written", test_last_date_sidecar_deleted_when_not_written),
+        ("Snapshot never newer than CSV", test_snapshot_never_newer_than_csv),
+        ("Snapshot cleanup failure keeps CSV write", test_snapshot_cleanup_failure_keeps_csv_write),
+        ("File upload refreshes CSV companions", test_file_upload_refreshes_csv_companions),
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for name, test_func in tests:
+        try:
+            print(f"\n🧪 Testing: {name}")
+            test_func()
+            print(f"   ✅ PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+    
+    print("\n" + "=" * 80)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+    
+    if failed > 0:
+        sys.exit(1)
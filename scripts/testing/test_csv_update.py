@@ -1,6 +1,7 @@
 """Comprehensive tests for CSV update functionality."""
 
 import sys
+import time
 from pathlib import Path
 import pandas as pd
 import tempfile
@@ -374,6 +375,84 @@ def test_empty_cloud_handling():
         shutil.rmtree(test_dir)
 
 
+def test_earlier_date_inserted_in_order():
+    """Test that a date older than existing records is merged in date order."""
+    
+    existing_main = pd.DataFrame({
+        'Report_Date': ['2016-12-09', '2016-12-23'],
+        'Q1\'14': [27.85, 28.10]
+    })
+    existing_confidence = pd.DataFrame({
+        'Report_Date': ['2016-12-09', '2016-12-23'],
+        'Confidence': [85.5, 90.0]
+    })
+    
+    def mock_process_image(image_path):
+        return [{
+            'report_date': '2016-12-16',
+            'quarter': 'Q1\'14',
+            'eps': 28.0,
+            'bar_color': 'dark',
+            'bar_confidence': 'high'
+        }]
+    
+    with patch('src.factset_report_analyzer.core.ocr.processor.read_csv_from_cloud') as mock_read:
+        def read_side_effect(path):
+            if path == 'extracted_estimates.csv':
+                return existing_main.copy()
+            elif path == 'extracted_estimates_confidence.csv':
+                return existing_confidence.copy()
+            return None
+        
+        mock_read.side_effect = read_side_effect
+        
+        test_dir = Path(tempfile.mkdtemp())
+        test_image = test_dir / '20161216-6.png'
+        test_image.touch()
+        
+        with patch('src.factset_report_analyzer.core.ocr.processor.process_image', side_effect=mock_process_image):
+            main_df, conf_df = process_directory(test_dir)
+        
+        assert main_df['Report_Date'].tolist() == ['2016-12-09', '2016-12-16', '2016-12-23']
+        assert conf_df['Report_Date'].tolist() == ['2016-12-09', '2016-12-16', '2016-12-23']
+        assert conf_df.iloc[2]['Confidence'] == 90.0
+        
+        import shutil
+        shutil.rmtree(test_dir)
+
+
+def test_interrupt_stops_queued_images():
+    """Test that an interrupt while results are collected cancels the queued OCR calls."""
+    
+    processed = []
+    
+    def mock_process_image(image_path):
+        processed.append(image_path.name)
+        if image_path.name == '20160101-6.png':
+            raise KeyboardInterrupt
+        time.sleep(0.01)
+        return []
+    
+    with patch('src.factset_report_analyzer.core.ocr.processor.read_csv_from_cloud', return_value=None):
+        test_dir = Path(tempfile.mkdtemp())
+        for day in range(60):
+            (test_dir / f"2016{1 + day // 28:02d}{1 + day % 28:02d}-6.png").touch()
+        
+        with patch('src.factset_report_analyzer.core.ocr.processor.process_image', side_effect=mock_process_image):
+            try:
+                process_directory(test_dir)
+            except KeyboardInterrupt:
+                pass
+            else:
+                raise AssertionError("KeyboardInterrupt was not raised")
+        
+        # Only the calls already running finish
+        assert len(processed) < 60, f"{len(processed)} images processed after the interrupt"
+        
+        import shutil
+        shutil.rmtree(test_dir)
+
+
 if __name__ == '__main__':
     print("=" * 80)
     print("Comprehensive CSV Update Tests")
@@ -389,6 +468,8 @@ if __name__ == '__main__':
         ("Confidence merge", test_confidence_merge_with_existing),
         ("Both CSVs returned", test_both_csvs_returned),
         ("Empty cloud handling", test_empty_cloud_handling),
+        ("Earlier date inserted in order", test_earlier_date_inserted_in_order),
+        ("Interrupt stops queued images", test_interrupt_stops_queued_images),
     ]
     
     passed = 0
@@ -0,0 +1,183 @@
+"""Tests for the PDF downloader's persistent 404 cache."""
+
+import io
+import json
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.factset_report_analyzer.core import downloader
+
+
+def _url(date: datetime, date_format: str) -> str:
+    return f"{downloader.BASE_URL}EarningsInsight_{date.strftime(date_format)}.pdf"
+
+
+def _run(start_date: datetime, end_date: datetime, head_status, cache_path: Path, pdf_content: bytes = b'%PDF-1.4'):
+    """Run download_pdfs with HEAD statuses from head_status(url) and GET bodies of pdf_content."""
+    @contextmanager
+    def open_url(url, method='GET'):
+        response = io.BytesIO(pdf_content)
+        response.status = 200
+        yield response
+    
+    with patch.object(downloader, '_head_status', side_effect=head_status), \
+         patch.object(downloader, '_open_url', side_effect=open_url):
+        return downloader.download_pdfs(start_date, end_date, rate_limit=0, miss_cache_path=cache_path)
+
+
+def test_recent_404s_not_cached():
+    """Test that 404s are only cached for dates older than MISS_CACHE_MIN_AGE_DAYS."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=downloader.MISS_CACHE_MIN_AGE_DAYS + 3)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / 'missing.json'
+        _run(start_date, end_date, lambda url: 404, cache_path)
+        missing_urls, _ = downloader._load_miss_cache(cache_path)
+    
+    for days in range((end_date - start_date).days + 1):
+        if days == downloader.MISS_CACHE_MIN_AGE_DAYS:
+            continue  # boundary depends on the time the run started
+        date = end_date - timedelta(days=days)
+        cached = {_url(date, date_format) for date_format in downloader.DATE_FORMATS} <= missing_urls
+        assert cached == (days > downloader.MISS_CACHE_MIN_AGE_DAYS), f"{date.date()}: cached={cached}"
+
+
+def test_server_errors_and_timeouts_not_cached():
+    """Test that 5xx responses and timeouts are not cached as missing."""
+    start_date = datetime(2016, 1, 1)
+    end_date = datetime(2016, 1, 3)
+    not_found = _url(datetime(2016, 1, 1), '%m%d%y')
+    
+    def head_status(url):
+        if url == not_found:
+            return 404
+        if '0102' in url:
+            raise TimeoutError('timed out')
+        return 503
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / 'missing.json'
+        result = _run(start_date, end_date, head_status, cache_path)
+        missing_urls, _ = downloader._load_miss_cache(cache_path)
+    
+    assert result == []
+    assert missing_urls == {not_found}
+
+
+def test_legacy_list_format_loads():
+    """Test that a cache file holding a plain URL list (older format) is still used."""
+    date = datetime(2016, 1, 5)
+    legacy_urls = [_url(date, date_format) for date_format in downloader.DATE_FORMATS]
+    requested = []
+    
+    def head_status(url):
+        requested.append(url)
+        return 404
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / 'missing.json'
+        cache_path.write_text(json.dumps(legacy_urls))
+        
+        assert downloader._load_miss_cache(cache_path) == (set(legacy_urls), {})
+        
+        _run(date, date, head_status, cache_path)
+        assert requested == []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        assert downloader._load_miss_cache(Path(tmp) / 'absent.json') == (set(), {})
+
+
+def test_format_hits_round_trip():
+    """Test that format hits are saved with the cache and loaded back."""
+    found_url = _url(datetime(2016, 1, 5), '%m%d%Y')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / 'missing.json'
+        downloader._save_miss_cache(cache_path, {'https://example.com/a.pdf'}, {'%m%d%y': 3})
+        assert downloader._load_miss_cache(cache_path) == ({'https://example.com/a.pdf'}, {'%m%d%y': 3})
+        
+        result = _run(datetime(2016, 1, 4), datetime(2016, 1, 5), lambda url: 200 if url == found_url else 404, cache_path)
+        missing_urls, format_hits = downloader._load_miss_cache(cache_path)
+    
+    assert [pdf['url'] for pdf in result] == [found_url]
+    assert format_hits == {'%m%d%y': 3, '%m%d%Y': 1}
+    assert 'https://example.com/a.pdf' in missing_urls
+    assert _url(datetime(2016, 1, 5), '%m%d%y') in missing_urls
+
+
+def test_error_stops_queued_probes():
+    """Test that an interrupt while results are collected cancels the dates still queued."""
+    requested = []
+    
+    def head_status(url):
+        requested.append(url)
+        time.sleep(0.005)
+        return 404
+    
+    def interrupt_at_progress(*args, **kwargs):
+        if 'Progress' in str(args[0]):
+            raise KeyboardInterrupt  # Ctrl-C at the first progress line (200 URLs tested)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / 'missing.json'
+        try:
+            with patch.object(downloader, 'print', create=True, side_effect=interrupt_at_progress):
+                _run(datetime(2016, 1, 1), datetime(2016, 12, 31), head_status, cache_path)
+        except KeyboardInterrupt:
+            pass
+        else:
+            raise AssertionError("KeyboardInterrupt was not raised")
+        missing_urls, _ = downloader._load_miss_cache(cache_path)
+    
+    # Only the probes already running finish (a year of dates is 732 URLs)
+    assert len(requested) < 300, f"{len(requested)} URLs requested"
+    # 404s collected before the error are still saved
+    assert _url(datetime(2016, 12, 31), '%m%d%y') in missing_urls
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("Downloader Tests")
+    print("=" * 80)
+    
+    tests = [
+        ("Recent 404s not cached", test_recent_404s_not_cached),
+        ("Server errors and timeouts not cached", test_server_errors_and_timeouts_not_cached),
+        ("Legacy list format loads", test_legacy_list_format_loads),
+        ("Format hits round trip", test_format_hits_round_trip),
+        ("Error stops queued probes", test_error_stops_queued_probes),
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for name, test_func in tests:
+        try:
+            print(f"\n🧪 Testing: {name}")
+            test_func()
+            print(f"   ✅ PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+    
+    print("\n" + "=" * 80)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+    
+    if failed > 0:
+        sys.exit(1)
@@ -0,0 +1,78 @@
+"""Tests for chart extraction scheduling (process pool vs. in-process)."""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.factset_report_analyzer.core import extractor
+
+
+def _fake_extract_one(pdf_path: Path):
+    return f"✅ {pdf_path.name}", (f"{pdf_path.stem}.png", b'png')
+
+
+def test_single_pdf_extracted_in_process():
+    """Test that a single PDF is extracted without starting a process pool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / 'EarningsInsight_20160101_010116.pdf'
+        pdf_path.touch()
+        
+        with patch.object(extractor, 'ProcessPoolExecutor', side_effect=AssertionError("pool started")), \
+             patch.object(extractor, '_extract_one', side_effect=_fake_extract_one):
+            charts = extractor.extract_charts([pdf_path, Path(tmp) / 'missing.pdf'])
+    
+    assert charts == [('EarningsInsight_20160101_010116.png', b'png')]
+
+
+def test_pool_unavailable_falls_back_to_in_process():
+    """Test that all PDFs are still extracted in order if the process pool cannot start."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_paths = [Path(tmp) / f'EarningsInsight_2016010{day}_010{day}16.pdf' for day in range(1, 4)]
+        for pdf_path in pdf_paths:
+            pdf_path.touch()
+        
+        with patch.object(extractor, 'ProcessPoolExecutor', side_effect=OSError("no semaphores")), \
+             patch.object(extractor, '_extract_one', side_effect=_fake_extract_one):
+            charts = extractor.extract_charts(pdf_paths)
+    
+    assert [name for name, _ in charts] == [f"{pdf_path.stem}.png" for pdf_path in pdf_paths]
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("Extractor Tests")
+    print("=" * 80)
+    
+    tests = [
+        ("Single PDF extracted in process", test_single_pdf_extracted_in_process),
+        ("Pool unavailable falls back to in-process", test_pool_unavailable_falls_back_to_in_process),
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for name, test_func in tests:
+        try:
+            print(f"\n🧪 Testing: {name}")
+            test_func()
+            print(f"   ✅ PASSED")
+            passed += 1
+        except AssertionError as e:
+            print(f"   ❌ FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"   ❌ ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+    
+    print("\n" + "=" * 80)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+    
+    if failed > 0:
+        sys.exit(1)
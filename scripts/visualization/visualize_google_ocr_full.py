@@ -1,10 +1,12 @@
 """Script to perform full image OCR using Google Cloud Vision API and display text."""
 
+import hashlib
 from pathlib import Path
 import cv2
 import numpy as np
 import os
 from dotenv import load_dotenv
+from src.factset_report_analyzer.core.ocr.google_vision_processor import get_google_vision_client
 
 try:
     from google.cloud import vision
@@ -16,112 +18,180 @@ except ImportError:
 # Load environment variables from .env file
 load_dotenv()
 
+# Maximum number of images per batch_annotate_images request
+BATCH_SIZE = 16
 
-def visualize_google_ocr_full(image_path: Path, output_path: Path):
-    """Perform full image OCR using Google Cloud Vision API and display text."""
-    # Read image
-    image = cv2.imread(str(image_path))
-    if image is None:
-        print(f"Cannot read image: {image_path}")
+# Raw AnnotateImageResponse protos keyed by SHA-256 of the image bytes
+CACHE_DIR = Path('output/cache/google_ocr_full')
+
+
+def visualize_google_ocr_full(image_paths: list[Path], output_dir: Path, use_cache: bool = True):
+    """Perform full image OCR using Google Cloud Vision API and display text.
+
+    Images are sent in batches of up to BATCH_SIZE per API request. Each result is
+    saved as `<image stem>_google_ocr_full.png` in output_dir. With use_cache,
+    responses are stored in CACHE_DIR by image hash and reruns on unchanged
+    images skip the API call.
+    """
+    # Read images (raw bytes are sent to the API, decoded arrays are used for drawing)
+    images = []
+    for image_path in image_paths:
+        image_bytes = image_path.read_bytes() if image_path.exists() else b''
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR) if image_bytes else None
+        if image is None:
+            print(f"Cannot read image: {image_path}")
+            continue
+        images.append((image_path, image_bytes, image))
+
+    if not images:
         return
-    
+
     if not GOOGLE_VISION_AVAILABLE:
         print("Google Cloud Vision is not installed.")
         return
-    
-    # Initialize Google Cloud Vision
+
+    # Images are keyed by content hash (identical images are only sent once)
+    keys = [hashlib.sha256(image_bytes).hexdigest() for _, image_bytes, _ in images]
+    image_bytes_by_key = {key: image_bytes for key, (_, image_bytes, _) in zip(keys, images)}
+
+    # Look up cached responses
+    responses = {}
+    if use_cache:
+        for key in image_bytes_by_key:
+            cache_path = CACHE_DIR / f"{key}.pb"
+            if cache_path.exists():
+                responses[key] = vision.AnnotateImageResponse.deserialize(cache_path.read_bytes())
+        if responses:
+            print(f"Loaded {len(responses)} cached OCR results from {CACHE_DIR}")
+
+    uncached = [key for key in image_bytes_by_key if key not in responses]
+    if uncached:
+        google_client = _init_google_client()
+        if google_client is None:
+            if not responses:
+                return
+            uncached = []
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Perform Google Vision API OCR on full images
+    print(f"\n=== Processing full image OCR with Google Cloud Vision ({len(images)} images) ===")
+
+    for start in range(0, len(uncached), BATCH_SIZE):
+        batch = uncached[start:start + BATCH_SIZE]
+
+        try:
+            # Call Google Vision API (full images, original lossless file bytes)
+            requests = [
+                vision.AnnotateImageRequest(
+                    image=vision.Image(content=image_bytes_by_key[key]),
+                    features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
+                )
+                for key in batch
+            ]
+            batch_response = google_client.batch_annotate_images(requests=requests)
+        except Exception as e:
+            print(f"Google OCR error: {e}")
+            import traceback
+            traceback.print_exc()
+            continue
+
+        # Responses are returned in request order
+        for key, response in zip(batch, batch_response.responses):
+            responses[key] = response
+            if use_cache and not response.error.message:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                (CACHE_DIR / f"{key}.pb").write_bytes(vision.AnnotateImageResponse.serialize(response))
+
+    for (image_path, _, image), key in zip(images, keys):
+        if key in responses:
+            output_path = output_dir / f"{image_path.stem}_google_ocr_full.png"
+            _visualize_response(image_path, image, responses[key], output_path)
+
+
+def _init_google_client():
+    """Initialize the Google Cloud Vision client from the .env key file (None on failure)."""
     try:
         # Check key file path from .env file
         creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        
+
         if not creds_path:
             print("Google Cloud Vision authentication required.")
             print("Add the following to your .env file:")
             print("  GOOGLE_APPLICATION_CREDENTIALS=/path/to/your-key.json")
-            return
-        
+            return None
+
         # Check if it's a JSON file path
         if not creds_path.endswith('.json') or not Path(creds_path).exists():
             print(f"Error: Key file not found: {creds_path}")
-            return
-        
-        from google.oauth2 import service_account
-        credentials = service_account.Credentials.from_service_account_file(creds_path)
-        google_client = vision.ImageAnnotatorClient(credentials=credentials)
+            return None
+
+        # Shared client (credentials are parsed once per key file)
+        google_client = get_google_vision_client()
         print(f"Google Cloud Vision authentication completed: {creds_path}")
         print("Google Cloud Vision initialization completed")
+        return google_client
     except Exception as e:
         print(f"Google Cloud Vision initialization failed: {e}")
-        return
-    
-    # Perform Google Vision API OCR on full image
-    print("\n=== Processing full image OCR with Google Cloud Vision ===")
-    
+        return None
+
+
+def _visualize_response(image_path: Path, image: np.ndarray, response, output_path: Path):
+    """Draw and print the OCR results of a single AnnotateImageResponse."""
+    print(f"\n--- {image_path.name} ---")
+
     try:
-        # Convert image to bytes
-        _, buffer = cv2.imencode('.jpg', image)
-        image_bytes = buffer.tobytes()
-        
-        # Call Google Vision API (full image)
-        vision_image = vision.Image(content=image_bytes)
-        response = google_client.text_detection(image=vision_image)
-        
         if response.error.message:
             print(f"Google Vision API error: {response.error.message}")
             return
-        
+
         # Create result image
         img_result = image.copy()
-        ocr_results = []
-        
+        boxes = []
+        labels = []
+        top_results = []  # (index, text, confidence) of the first 50 boxes
+
         if response.text_annotations:
             # First result is full text
             full_text = response.text_annotations[0].description
             print(f"\nFull recognized text:\n{full_text[:500]}...")  # Print first 500 characters only
-            
-            # Rest are individual word/text regions
+
+            # Rest are individual word/text regions (Vision returns 4-vertex boxes);
+            # each annotation is read once and only the values needed later are kept
             for i, annotation in enumerate(response.text_annotations[1:], 1):
                 vertices = annotation.bounding_poly.vertices
-                
-                # Extract bounding box coordinates
-                points = []
-                for vertex in vertices:
-                    points.append([vertex.x, vertex.y])
-                
-                if len(points) >= 3:
-                    text = annotation.description
-                    confidence = getattr(annotation, 'confidence', 1.0)
-                    
-                    ocr_results.append({
-                        'index': i,
-                        'text': text,
-                        'bbox': points,
-                        'confidence': confidence
-                    })
-                    
-                    # Draw box
-                    pts = np.array(points, dtype=np.int32)
-                    cv2.polylines(img_result, [pts], True, (0, 255, 0), 2)
-                    
-                    # Display text
-                    if points:
-                        x, y = int(points[0][0]), int(points[0][1])
-                        display_text = text[:30] if len(text) > 30 else text
-                        cv2.putText(img_result, display_text, (x, y - 5),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 3)
-        
+                if len(vertices) != 4:
+                    continue
+                pts = [(v.x, v.y) for v in vertices]
+                text = annotation.description
+                boxes.append(pts)
+                labels.append((pts[0], text[:30]))
+                if len(top_results) < 50:
+                    top_results.append((i, text, annotation.confidence))
+
+        n = len(boxes)
+
+        # Draw boxes
+        if n:
+            cv2.polylines(img_result, list(np.array(boxes, dtype=np.int32)), True, (0, 255, 0), 2)
+
+        # Display text at the first vertex of each box
+        for (x, y), text in labels:
+            cv2.putText(img_result, text, (x, y - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 3)
+
         # Save
         cv2.imwrite(str(output_path), img_result)
         print(f"\nGoogle Cloud Vision visualization results saved to {output_path}")
-        
+
         # Print results
-        print(f"\n=== Google Cloud Vision Results (Total: {len(ocr_results)}) ===")
-        for result in ocr_results[:50]:  # Print first 50 only
-            print(f"{result['index']:3d}. '{result['text']}' (confidence: {result['confidence']:.2f})")
-        
-        if len(ocr_results) > 50:
-            print(f"... and {len(ocr_results) - 50} more")
-            
+        print(f"\n=== Google Cloud Vision Results (Total: {n}) ===")
+        for i, text, confidence in top_results:  # Print first 50 only
+            print(f"{i:3d}. '{text}' (confidence: {confidence:.2f})")
+
+        if n > 50:
+            print(f"... and {n - 50} more")
+
     except Exception as e:
         print(f"Google OCR error: {e}")
         import traceback
@@ -129,7 +199,7 @@ def visualize_google_ocr_full(image_path: Path, output_path: Path):
 
 
 if __name__ == '__main__':
-    test_image = Path('output/estimates/20161209-6.png')
-    output_path = Path('output/preprocessing_test/20161209-6_google_ocr_full.png')
-    
-    visualize_google_ocr_full(test_image, output_path)
+    test_images = [Path('output/estimates/20161209-6.png')]
+    output_dir = Path('output/preprocessing_test')
+
+    visualize_google_ocr_full(test_images, output_dir)
@@ -1,101 +1,256 @@
 """Script to visualize various image preprocessing techniques."""
 
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
 import cv2
 import numpy as np
-from pathlib import Path
+
+# Shared OpenCV objects (created once per process instead of per call)
+_CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+# Grayscale image shared with pool workers (attached once per worker)
+_gray: np.ndarray | None = None
+_gray_shm: shared_memory.SharedMemory | None = None
+_gray_otsu_threshold: float | None = None
+
+
+def _otsu_threshold(gray: np.ndarray) -> float:
+    """Compute the OTSU threshold of an 8-bit image from its 256-bin histogram.
+
+    Maximizes the between-class variance over all levels at once (same result
+    as cv2.threshold with THRESH_OTSU).
+    """
+    p = np.bincount(gray.ravel(), minlength=256) / gray.size
+    q1 = np.cumsum(p)
+    q2 = 1.0 - q1
+    m1 = np.cumsum(np.arange(256) * p)
+    eps = np.finfo(np.float32).eps
+    valid = (np.minimum(q1, q2) >= eps) & (np.maximum(q1, q2) <= 1.0 - eps)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.where(valid, q1 * q2 * (m1 / q1 - (m1[-1] - m1) / q2) ** 2, 0.0)
+    return float(np.argmax(sigma))
+
+
+def _init_worker(shm_name: str, shape: tuple[int, ...], otsu_threshold: float):
+    """Attach the shared grayscale buffer and its OTSU threshold in a pool worker."""
+    global _gray, _gray_shm, _gray_otsu_threshold
+    _gray_shm = shared_memory.SharedMemory(name=shm_name)
+    _gray = np.ndarray(shape, dtype=np.uint8, buffer=_gray_shm.buf)
+    _gray_otsu_threshold = otsu_threshold
+
+
+def _run_task(task: tuple[Callable, Path]) -> str:
+    """Run a preprocessing variant on the shared grayscale image and save its outputs."""
+    func, output_dir = task
+    message, results = func(_gray)
+    for filename, result in results.items():
+        cv2.imwrite(str(output_dir / filename), result)
+    return message
+
+
+# The grayscale OTSU threshold is computed once in the main process, so the
+# variants below only apply it instead of rebuilding the histogram each time
+def _otsu_binary(gray: np.ndarray):
+    threshold, otsu_binary = cv2.threshold(gray, _gray_otsu_threshold, 255, cv2.THRESH_BINARY)
+    return f"OTSU binarization completed (threshold: {threshold})", {'02_otsu_binary.png': otsu_binary}
+
+
+def _otsu_binary_inv(gray: np.ndarray):
+    _, otsu_binary_inv = cv2.threshold(gray, _gray_otsu_threshold, 255, cv2.THRESH_BINARY_INV)
+    return "OTSU binarization (inverted) completed", {'03_otsu_binary_inv.png': otsu_binary_inv}
+
+
+def _adaptive_threshold(gray: np.ndarray):
+    adaptive_thresh = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+    return "Adaptive threshold completed", {'04_adaptive_threshold.png': adaptive_thresh}
+
+
+def _clahe(gray: np.ndarray):
+    # CLAHE (Contrast Limited Adaptive Histogram Equalization)
+    return _clahe_results(_CLAHE.apply(gray))
+
+
+def _clahe_results(clahe_gray: np.ndarray):
+    # The equalized image is thresholded right away for the CLAHE + OTSU variant
+    _, clahe_otsu_binary = cv2.threshold(clahe_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return "CLAHE completed\nCLAHE + OTSU completed", {
+        '05_clahe.png': clahe_gray,
+        '11_clahe_otsu.png': clahe_otsu_binary,
+    }
+
+
+def _histogram_equalization(gray: np.ndarray):
+    return _histogram_equalization_results(cv2.equalizeHist(gray))
+
+
+def _histogram_equalization_results(hist_eq: np.ndarray):
+    # The equalized image is reused for the Histogram equalization + OTSU variant
+    _, hist_eq_otsu_binary = cv2.threshold(hist_eq, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return "Histogram equalization completed\nHistogram equalization + OTSU completed", {
+        '06_histogram_equalization.png': hist_eq,
+        '13_hist_eq_otsu.png': hist_eq_otsu_binary,
+    }
+
+
+def _gaussian_blur(gray: np.ndarray):
+    return _gaussian_blur_results(cv2.GaussianBlur(gray, (5, 5), 0))
+
+
+def _gaussian_blur_results(gaussian_blur: np.ndarray):
+    return "Gaussian blur completed", {'07_gaussian_blur.png': gaussian_blur}
+
+
+def _denoising(gray: np.ndarray):
+    return _denoising_results(cv2.fastNlMeansDenoising(gray, None, 10, 7, 21))
+
+
+def _denoising_results(denoised: np.ndarray):
+    # Non-local Means Denoising is the most expensive step, so the result
+    # is shared by the plain and the OTSU variant
+    _, denoised_otsu_binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return "Denoising completed\nDenoising + OTSU completed", {
+        '08_denoised.png': denoised,
+        '12_denoised_otsu.png': denoised_otsu_binary,
+    }
+
+
+def _morphology_closing(gray: np.ndarray):
+    _, otsu_binary = cv2.threshold(gray, _gray_otsu_threshold, 255, cv2.THRESH_BINARY)
+    closing = cv2.morphologyEx(otsu_binary, cv2.MORPH_CLOSE, _MORPH_KERNEL)
+    return "Morphology operation (Closing) completed", {'09_morphology_closing.png': closing}
+
+
+def _morphology_opening(gray: np.ndarray):
+    _, otsu_binary = cv2.threshold(gray, _gray_otsu_threshold, 255, cv2.THRESH_BINARY)
+    opening = cv2.morphologyEx(otsu_binary, cv2.MORPH_OPEN, _MORPH_KERNEL)
+    return "Morphology operation (Opening) completed", {'10_morphology_opening.png': opening}
+
+
+# Independent variants derived from the grayscale image
+PREPROCESSING_TASKS = [
+    _otsu_binary,
+    _otsu_binary_inv,
+    _adaptive_threshold,
+    _clahe,
+    _histogram_equalization,
+    _gaussian_blur,
+    _denoising,
+    _morphology_closing,
+    _morphology_opening,
+]
+
+
+def _cuda_available() -> bool:
+    """Check for an OpenCV build with CUDA image processing and a CUDA device."""
+    try:
+        return hasattr(cv2.cuda, 'createCLAHE') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# CUDA counterparts of the expensive variants (the input stays on the GPU,
+# only results are downloaded; OTSU thresholds still run on the CPU)
+def _clahe_cuda(gpu_gray):
+    clahe = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return _clahe_results(clahe.apply(gpu_gray, cv2.cuda.Stream_Null()).download())
+
+
+def _histogram_equalization_cuda(gpu_gray):
+    return _histogram_equalization_results(cv2.cuda.equalizeHist(gpu_gray).download())
+
+
+def _gaussian_blur_cuda(gpu_gray):
+    gaussian_filter = cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, (5, 5), 0)
+    return _gaussian_blur_results(gaussian_filter.apply(gpu_gray).download())
+
+
+def _denoising_cuda(gpu_gray):
+    denoised = cv2.cuda.fastNlMeansDenoising(gpu_gray, 10, search_window=21, block_size=7)
+    return _denoising_results(denoised.download())
+
+
+CUDA_TASKS = {
+    _clahe: _clahe_cuda,
+    _histogram_equalization: _histogram_equalization_cuda,
+    _gaussian_blur: _gaussian_blur_cuda,
+    _denoising: _denoising_cuda,
+}
 
 
 def apply_preprocessing_techniques(image_path: Path, output_dir: Path):
-    """Apply various preprocessing techniques and save results."""
-    # Read image
-    image = cv2.imread(str(image_path))
+    """Apply various preprocessing techniques and save results.
+
+    The variants only depend on the grayscale image, so they run in a process
+    pool that reads the grayscale buffer from shared memory. If OpenCV was built
+    with CUDA and a device is present, the expensive variants run on the GPU
+    while the pool handles the rest.
+    """
+    # Read image (file bytes are kept to copy a PNG source as the original)
+    image_bytes = np.fromfile(image_path, dtype=np.uint8) if image_path.is_file() else None
+    image = cv2.imdecode(image_bytes, cv2.IMREAD_COLOR) if image_bytes is not None and image_bytes.size else None
     if image is None:
         print(f"Cannot read image: {image_path}")
         return
-    
+
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 1. Original image
-    cv2.imwrite(str(output_dir / '00_original.png'), image)
-    print("Original image saved")
-    
+
     # 2. Grayscale conversion
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    cv2.imwrite(str(output_dir / '01_grayscale.png'), gray)
-    print("Grayscale conversion completed")
-    
-    # 3. OTSU binarization
-    _, otsu_binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    cv2.imwrite(str(output_dir / '02_otsu_binary.png'), otsu_binary)
-    print(f"OTSU binarization completed (threshold: {_})")
-    
-    # 4. OTSU binarization (inverted)
-    _, otsu_binary_inv = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-    cv2.imwrite(str(output_dir / '03_otsu_binary_inv.png'), otsu_binary_inv)
-    print("OTSU binarization (inverted) completed")
-    
-    # 5. Adaptive threshold
-    adaptive_thresh = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-    )
-    cv2.imwrite(str(output_dir / '04_adaptive_threshold.png'), adaptive_thresh)
-    print("Adaptive threshold completed")
-    
-    # 6. CLAHE (Contrast Limited Adaptive Histogram Equalization)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    clahe_gray = clahe.apply(gray)
-    cv2.imwrite(str(output_dir / '05_clahe.png'), clahe_gray)
-    print("CLAHE completed")
-    
-    # 7. Histogram equalization
-    hist_eq = cv2.equalizeHist(gray)
-    cv2.imwrite(str(output_dir / '06_histogram_equalization.png'), hist_eq)
-    print("Histogram equalization completed")
-    
-    # 8. Gaussian blur
-    gaussian_blur = cv2.GaussianBlur(gray, (5, 5), 0)
-    cv2.imwrite(str(output_dir / '07_gaussian_blur.png'), gaussian_blur)
-    print("Gaussian blur completed")
-    
-    # 9. Denoising (Non-local Means Denoising)
-    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-    cv2.imwrite(str(output_dir / '08_denoised.png'), denoised)
-    print("Denoising completed")
-    
-    # 10. Morphology operation (Closing)
-    kernel = np.ones((3, 3), np.uint8)
-    closing = cv2.morphologyEx(otsu_binary, cv2.MORPH_CLOSE, kernel)
-    cv2.imwrite(str(output_dir / '09_morphology_closing.png'), closing)
-    print("Morphology operation (Closing) completed")
-    
-    # 11. Morphology operation (Opening)
-    opening = cv2.morphologyEx(otsu_binary, cv2.MORPH_OPEN, kernel)
-    cv2.imwrite(str(output_dir / '10_morphology_opening.png'), opening)
-    print("Morphology operation (Opening) completed")
-    
-    # 12. CLAHE + OTSU
-    clahe_otsu = clahe.apply(gray)
-    _, clahe_otsu_binary = cv2.threshold(clahe_otsu, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    cv2.imwrite(str(output_dir / '11_clahe_otsu.png'), clahe_otsu_binary)
-    print("CLAHE + OTSU completed")
-    
-    # 13. Denoising + OTSU
-    denoised_otsu = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-    _, denoised_otsu_binary = cv2.threshold(denoised_otsu, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    cv2.imwrite(str(output_dir / '12_denoised_otsu.png'), denoised_otsu_binary)
-    print("Denoising + OTSU completed")
-    
-    # 14. Histogram equalization + OTSU
-    hist_eq_otsu = cv2.equalizeHist(gray)
-    _, hist_eq_otsu_binary = cv2.threshold(hist_eq_otsu, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    cv2.imwrite(str(output_dir / '13_hist_eq_otsu.png'), hist_eq_otsu_binary)
-    print("Histogram equalization + OTSU completed")
-    
+
+    # 3-14. Grayscale-derived variants
+    cuda_tasks = [CUDA_TASKS[func] for func in PREPROCESSING_TASKS if func in CUDA_TASKS] if _cuda_available() else []
+    cpu_tasks = [func for func in PREPROCESSING_TASKS if not cuda_tasks or func not in CUDA_TASKS]
+
+    shm = shared_memory.SharedMemory(create=True, size=gray.nbytes)
+    try:
+        np.ndarray(gray.shape, dtype=np.uint8, buffer=shm.buf)[:] = gray
+
+        max_workers = min(len(cpu_tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shm.name, gray.shape, _otsu_threshold(gray))
+        ) as executor:
+            messages = executor.map(_run_task, [(func, output_dir) for func in cpu_tasks])
+
+            # 1-2. Original and grayscale PNGs are encoded and written while the pool works
+            if image_path.suffix.lower() == '.png':
+                image_bytes.tofile(output_dir / '00_original.png')
+            else:
+                cv2.imwrite(str(output_dir / '00_original.png'), image)
+            print("Original image saved")
+            cv2.imwrite(str(output_dir / '01_grayscale.png'), gray)
+            print("Grayscale conversion completed")
+
+            # GPU variants run in this process while the pool works
+            if cuda_tasks:
+                gpu_gray = cv2.cuda_GpuMat()
+                gpu_gray.upload(gray)
+                for func in cuda_tasks:
+                    message, results = func(gpu_gray)
+                    for filename, result in results.items():
+                        cv2.imwrite(str(output_dir / filename), result)
+                    for line in message.splitlines():
+                        print(f"{line} (CUDA)")
+
+            for message in messages:
+                print(message)
+    finally:
+        shm.close()
+        shm.unlink()
+
     print(f"\nAll preprocessing results saved to {output_dir}")
 
 
 if __name__ == '__main__':
     test_image = Path('output/estimates/20161209-6.png')
     output_dir = Path('output/preprocessing_test/image_preprocessing')
-    
+
     apply_preprocessing_techniques(test_image, output_dir)
@@ -2,31 +2,73 @@
 
 from __future__ import annotations
 
+import http.client
+import json
+import os
+import shutil
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Base URL for FactSet PDFs
 BASE_URL = "https://advantage.factset.com/hubfs/Website/Resources%20Section/Research%20Desk/Earnings%20Insight/"
 
+# Maximum concurrent date probes (the workload is HTTP latency bound)
+DOWNLOAD_MAX_WORKERS = 16
+
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+REQUEST_TIMEOUT = 5
+
+# One keep-alive connection per worker thread (HEAD and GET reuse the TLS session)
+_local = threading.local()
+
+# Date formats used in PDF filenames (121324, 12132024)
+DATE_FORMATS = ("%m%d%y", "%m%d%Y")
+
+# 404s are only cached for dates at least this old (recent reports may still be uploaded)
+MISS_CACHE_MIN_AGE_DAYS = 7
+
+# PDFs saved to outpath are streamed in chunks through a larger write buffer
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 def download_pdfs(
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     rate_limit: float = 0.05,
-    skip_existing: set[str] | None = None
+    skip_existing: set[str] | None = None,
+    miss_cache_path: Path | None = None,
+    outpath: Path | None = None
 ) -> list[dict]:
     """Download FactSet Earnings Insight PDFs.
     
     Downloads PDFs from FactSet's public repository. Available from 2016 to present.
+    Dates are probed concurrently by up to DOWNLOAD_MAX_WORKERS threads.
     
     Args:
         start_date: Start date for download (default: 2016-01-01)
         end_date: End date for download (default: today)
-        rate_limit: Wait time between requests in seconds (default: 0.05)
+        rate_limit: Minimum interval between requests in seconds, across all
+            workers (default: 0.05, i.e. at most 20 requests per second; 0 for
+            no limit). Workers take turns from a shared token bucket, so the
+            wait overlaps with requests in flight.
         skip_existing: Set of existing filenames to skip
+        miss_cache_path: JSON file of URLs known to return 404. Cached URLs are
+            not requested again, and new 404s for dates older than
+            MISS_CACHE_MIN_AGE_DAYS are added to it. The number of hits per date
+            format is stored with it (default: outpath/.missing_urls.json if
+            outpath is given, otherwise no cache)
+        outpath: Directory to save PDFs to. PDFs are streamed to disk instead of
+            being kept in memory, and dates already saved there are not requested
+            again (default: None, content is returned in memory)
         
     Returns:
         List of dictionaries containing download information:
@@ -35,7 +77,8 @@ def download_pdfs(
         - 'url': Download URL
         - 'size_kb': File size in KB
         - 'filename': Filename (without path)
-        - 'content': PDF file content (bytes)
+        - 'content': PDF file content (bytes, only without outpath)
+        - 'path': Saved PDF file path (only with outpath)
         
     Note:
         PDFs are available from 2016 onwards. If start_date is before 2016,
@@ -53,67 +96,324 @@ def download_pdfs(
         print(f"⚠️  Warning: PDFs are only available from 2016 onwards. Adjusting start_date to 2016-01-01.")
         start_date = min_date
     
+    if outpath is not None:
+        outpath.mkdir(parents=True, exist_ok=True)
+        if miss_cache_path is None:
+            miss_cache_path = outpath / '.missing_urls.json'
+    
     found_pdfs: list[dict] = []
-    current = end_date
     test_count = 0
     
     print("🔍 FactSet Earnings Insight PDF reverse search and download")
     print(f"Period: {end_date.date()} → {start_date.date()} (reverse)")
     print("=" * 80)
     
+    # Dates to probe, newest first
+    dates = []
+    current = end_date
     while current >= start_date:
-        # Date format conversion
-        formats = [
-            current.strftime("%m%d%y"),      # 121324
-            current.strftime("%m%d%Y"),      # 12132024
-        ]
-        
-        for fmt in formats:
-            url = f"{BASE_URL}EarningsInsight_{fmt}.pdf"
-            test_count += 1
+        dates.append(current)
+        current -= timedelta(days=1)  # Go back one day
+    
+    total_days = (end_date - start_date).days
+    
+    # Dates already saved to outpath (listed once instead of probed again)
+    saved_dates = _list_saved_dates(outpath) if outpath is not None else frozenset()
+    if saved_dates:
+        print(f"⏭️  {len(saved_dates)} PDFs already in {outpath}, skipping their dates")
+    
+    miss_cache, format_hits = _load_miss_cache(miss_cache_path) if miss_cache_path else (set(), {})
+    known_missing = frozenset(miss_cache)  # read-only snapshot for the workers
+    format_hits_changed = False
+    cache_before = datetime.now() - timedelta(days=MISS_CACHE_MIN_AGE_DAYS)
+    limiter = _RateLimiter(1 / rate_limit, 1) if rate_limit > 0 else None
+    
+    # Result lines are written in one batch with each progress line instead of one print per PDF
+    pending_lines: list[str] = []
+    
+    try:
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS) as executor:
+            # Dates are probed concurrently; results are collected in date order
+            results = executor.map(
+                lambda date: (None, 0, [], None) if date.strftime('%Y%m%d') in saved_dates
+                else _probe_date(date, skip_existing, limiter, known_missing, outpath, format_hits),
+                dates
+            )
             
             try:
-                # Download with urllib
-                req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req, timeout=5) as response:
-                    if response.status == 200:
+                for current, (pdf_info, tested, missing_urls, date_format) in zip(dates, results):
+                    test_count += tested
+                    if miss_cache_path and current < cache_before:
+                        miss_cache.update(missing_urls)
+                    if date_format:
+                        format_hits[date_format] = format_hits.get(date_format, 0) + 1
+                        format_hits_changed = True
+                    
+                    if pdf_info:
+                        found_pdfs.append(pdf_info)
+                        pending_lines.append(f"✅ {pdf_info['date']}: {pdf_info['format']:12s} | {pdf_info['size_kb']:6.1f} KB | Download complete")
+                    
+                    # Progress every 200 files
+                    if tested and test_count % 200 == 0:
+                        elapsed_days = (end_date - current).days
+                        progress = elapsed_days / total_days * 100 if total_days > 0 else 0
+                        pending_lines.append(f"⏳ Progress: {progress:.1f}% | Tested: {test_count:,} | Found: {len(found_pdfs)}")
+                        print('\n'.join(pending_lines))
+                        pending_lines.clear()
+            except BaseException:
+                # Errors and Ctrl-C stop the crawl: queued dates are not probed
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+    finally:
+        if miss_cache_path and (len(miss_cache) > len(known_missing) or format_hits_changed):
+            _save_miss_cache(miss_cache_path, miss_cache, format_hits)
+        if pending_lines:
+            print('\n'.join(pending_lines))
+    
+    print(f"\n📊 Final Results: {len(found_pdfs)} PDFs downloaded")
+    return found_pdfs
+
+
+def _probe_date(
+    current: datetime,
+    skip_existing: set[str] | None,
+    limiter: _RateLimiter | None,
+    miss_cache: frozenset[str],
+    outpath: Path | None = None,
+    format_hits: dict[str, int] | None = None
+) -> tuple[dict | None, int, list[str], str | None]:
+    """Try both filename formats for a single date.
+    
+    The format with more hits so far is tried first; the other one is only
+    probed if it misses.
+    
+    Args:
+        current: Report date to probe
+        skip_existing: Set of existing filenames to skip
+        limiter: Shared rate limiter acquired before each request (None for no limit)
+        miss_cache: URLs known to return 404 (not requested)
+        outpath: Directory to stream the PDF to (None to keep it in memory)
+        format_hits: Number of PDFs found so far per date format
+        
+    Returns:
+        Tuple of (download information dict or None, number of URLs tested,
+        URLs that returned 404, date format of the PDF found or None)
+    """
+    # Most successful date format first (stable sort keeps MMDDYY first on ties)
+    date_formats = sorted(DATE_FORMATS, key=lambda f: -(format_hits or {}).get(f, 0))
+    
+    pdf_info = None
+    hit_format = None
+    tested = 0
+    missing_urls = []
+    
+    for date_format in date_formats:
+        fmt = current.strftime(date_format)
+        url = f"{BASE_URL}EarningsInsight_{fmt}.pdf"
+        if url in miss_cache:
+            continue
+        tested += 1
+        
+        # Filename
+        filename = f"EarningsInsight_{current.strftime('%Y%m%d')}_{fmt}.pdf"
+        
+        # Skip if already exists in cloud (checked before any request is sent)
+        if skip_existing and filename in skip_existing:
+            continue
+        
+        try:
+            # Most candidate URLs are 404s, so check existence without the body first
+            if limiter:
+                limiter.acquire()
+            status = _head_status(url)
+            if status == 404:
+                missing_urls.append(url)
+            if status != 200 and status not in (405, 501):
+                continue  # 405/501: HEAD not allowed, fall back to GET
+            
+            # Download on the same keep-alive connection
+            if limiter:
+                limiter.acquire()
+            with _open_url(url) as response:
+                if response.status == 200:
+                    if outpath is not None:
+                        pdf_path = outpath / filename
+                        result = {'path': pdf_path}
+                        size_kb = _stream_to_file(response, pdf_path) / 1024
+                    else:
                         content = response.read()
+                        result = {'content': content}
                         size_kb = len(content) / 1024
-                        
-                        # Filename
-                        filename = f"EarningsInsight_{current.strftime('%Y%m%d')}_{fmt}.pdf"
-                        
-                        # Skip if already exists in cloud
-                        if skip_existing and filename in skip_existing:
-                            continue
-                        
-                        found_pdfs.append({
-                            'date': current.strftime("%Y-%m-%d"),
-                            'format': fmt,
-                            'url': url,
-                            'size_kb': size_kb,
-                            'filename': filename,
-                            'content': content
-                        })
-                        
-                        print(f"✅ {current.strftime('%Y-%m-%d')}: {fmt:12s} | {size_kb:6.1f} KB | Download complete")
-                        break  # Move to next date if found
-            
-            except urllib.error.HTTPError:
-                pass  # 404, etc.
-            except Exception:
-                pass
+                    
+                    pdf_info = {
+                        'date': current.strftime("%Y-%m-%d"),
+                        'format': fmt,
+                        'url': url,
+                        'size_kb': size_kb,
+                        'filename': filename,
+                        **result
+                    }
+                    hit_format = date_format
+                    break  # Move to next date if found
         
-        # Progress every 200 files
-        if test_count % 200 == 0:
-            elapsed_days = (end_date - current).days
-            total_days = (end_date - start_date).days
-            progress = elapsed_days / total_days * 100 if total_days > 0 else 0
-            print(f"⏳ Progress: {progress:.1f}% | Tested: {test_count:,} | Found: {len(found_pdfs)}")
+        except Exception:
+            pass  # Timeouts, connection errors, etc.
+    
+    return pdf_info, tested, missing_urls, hit_format
+
+
+class _RateLimiter:
+    """Thread-safe token bucket shared by the download workers.
+    
+    Up to `capacity` requests can start at once; after that requests start at
+    `rate` per second on average. A worker only sleeps when the bucket is
+    empty, so the wait overlaps with other workers' requests in flight.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance reserves the token; the wait happens outside the lock
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
         
-        current -= timedelta(days=1)  # Go back one day
-        time.sleep(rate_limit)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _list_saved_dates(outpath: Path) -> frozenset[str]:
+    """List the report dates (YYYYMMDD) of the PDFs already saved in outpath.
     
-    print(f"\n📊 Final Results: {len(found_pdfs)} PDFs downloaded")
-    return found_pdfs
+    Args:
+        outpath: Directory PDFs are saved to
+        
+    Returns:
+        Set of dates taken from `EarningsInsight_<YYYYMMDD>_<fmt>.pdf` filenames
+        (partial `.part` downloads are ignored)
+    """
+    with os.scandir(outpath) as entries:
+        return frozenset(
+            entry.name.split('_')[1]
+            for entry in entries
+            if entry.name.startswith('EarningsInsight_') and entry.name.endswith('.pdf') and entry.is_file()
+        )
+
+
+def _stream_to_file(response, path: Path) -> int:
+    """Stream a response body to a file.
+    
+    The body is written to `<name>.part` and renamed on completion, so an
+    interrupted download never leaves a truncated PDF under the final name.
+    
+    Returns:
+        File size in bytes
+    """
+    part_path = path.with_name(f"{path.name}.part")
+    try:
+        with open(part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+        part_path.replace(path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+
+def _get_connection(scheme: str, netloc: str) -> http.client.HTTPConnection:
+    """Get this thread's keep-alive connection to a host (created on first use)."""
+    if getattr(_local, 'netloc', None) != (scheme, netloc):
+        _drop_connection()
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        _local.connection = connection_class(netloc, timeout=REQUEST_TIMEOUT)
+        _local.netloc = (scheme, netloc)
+    return _local.connection
+
+
+def _drop_connection() -> None:
+    """Close this thread's connection (a new one is opened on the next request)."""
+    connection = getattr(_local, 'connection', None)
+    if connection is not None:
+        connection.close()
+    _local.connection = None
+    _local.netloc = None
+
+
+def _send(method: str, url: str) -> http.client.HTTPResponse:
+    """Send a request on this thread's connection, reconnecting once if the server closed it."""
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    
+    for attempt in range(2):
+        connection = _get_connection(parts.scheme, parts.netloc)
+        try:
+            connection.request(method, path, headers=REQUEST_HEADERS)
+            return connection.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            _drop_connection()
+            if attempt:
+                raise
+    raise AssertionError("unreachable")
+
+
+@contextmanager
+def _open_url(url: str, method: str = 'GET') -> Iterator:
+    """Open a URL on this thread's keep-alive connection.
+    
+    Redirects are followed with urllib. Unread body data is drained on exit so
+    the connection can be reused; after an error the connection is dropped.
+    
+    Yields:
+        Response object with a `status` attribute (readable for GET)
+    """
+    response = _send(method, url)
+    try:
+        if 300 <= response.status < 400 and response.getheader('Location'):
+            response.read()
+            req = urllib.request.Request(url, method=method, headers=REQUEST_HEADERS)
+            try:
+                with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as redirected:
+                    yield redirected
+            except urllib.error.HTTPError as e:
+                yield e
+            return
+        
+        yield response
+        response.read()
+    except BaseException:
+        _drop_connection()
+        raise
+
+
+def _head_status(url: str) -> int:
+    """Get the HTTP status of a URL with a HEAD request (no response body is transferred)."""
+    with _open_url(url, method='HEAD') as response:
+        return response.status
+
+
+def _load_miss_cache(path: Path) -> tuple[set[str], dict[str, int]]:
+    """Load the set of URLs known to return 404 and the hits per date format."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return set(), {}
+    
+    if isinstance(data, list):  # URL list only (older cache files)
+        return set(data), {}
+    return set(data.get('missing_urls', [])), dict(data.get('format_hits', {}))
+
 
+def _save_miss_cache(path: Path, miss_cache: set[str], format_hits: dict[str, int]) -> None:
+    """Save the set of URLs known to return 404 and the hits per date format."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'format_hits': format_hits, 'missing_urls': sorted(miss_cache)}
+    path.write_text(json.dumps(data, indent=0))
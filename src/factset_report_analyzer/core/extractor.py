@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import io
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
 import pdfplumber
 
+try:
+    import pypdfium2 as pdfium  # PDFium text extraction (fast keyword scan)
+except ImportError:
+    pdfium = None  # type: ignore[assignment]
+
 # Keywords to identify EPS chart pages
 KEYWORDS = [
     "Bottom-Up EPS Estimates: Current & Historical",
@@ -14,6 +25,86 @@ KEYWORDS = [
     "Bottom-Up EPS: Current & Historical",
 ]
 
+# Single pattern for all keywords (one scan of the page text)
+KEYWORD_PATTERN = re.compile('|'.join(re.escape(kw) for kw in KEYWORDS))
+
+# First word of the keywords ("Bottom-Up", "Bottom-up"), used to locate the title on the page
+KEYWORD_PREFIX_PATTERN = re.compile('|'.join(re.escape(prefix) for prefix in sorted({kw.split()[0] for kw in KEYWORDS})))
+
+# Chart pages are rendered at full page size and 300 DPI (the OCR heuristics are
+# tuned in pixels); zlib level 1 trades larger PNGs for much less encode time
+CHART_RESOLUTION = 300
+PNG_COMPRESS_LEVEL = 1
+
+
+def _page_search_order(num_pages: int, position_hint: float) -> list[int]:
+    """Order page indices by distance from the expected chart position.
+    
+    Args:
+        num_pages: Number of pages in the PDF
+        position_hint: Expected relative position of the chart page (0.0 = first, 1.0 = last)
+        
+    Returns:
+        Page indices starting at the hinted page and alternating outward
+        (earlier page first)
+    """
+    if num_pages == 0:
+        return []
+    start = min(num_pages - 1, max(0, round(position_hint * (num_pages - 1))))
+    order = [start]
+    for offset in range(1, num_pages):
+        order.extend(p for p in (start - offset, start + offset) if 0 <= p < num_pages)
+    return order
+
+
+def _find_keyword_page(pdf_path: Path, search_order: list[int]) -> int | None:
+    """Find the first page (in search order) whose text contains a keyword using PDFium.
+    
+    PDFium extracts text much faster than pdfplumber, so it is only used to pick
+    the candidate page; pdfplumber still confirms the match and renders the page.
+    
+    Returns:
+        Page index, or None if no page matched or PDFium is not available
+    """
+    if pdfium is None:
+        return None
+    
+    try:
+        doc = pdfium.PdfDocument(pdf_path)
+    except Exception:
+        return None
+    
+    try:
+        for page_num in search_order:
+            page = doc[page_num]
+            try:
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+            finally:
+                page.close()
+            
+            # PDFium separates lines with CRLF; compare with single spaces
+            if KEYWORD_PATTERN.search(' '.join(text.split())):
+                return page_num
+    except Exception:
+        return None
+    finally:
+        doc.close()
+    return None
+
+
+def _list_files(directories: set[Path]) -> dict[Path, set[str]]:
+    """List file names per directory (one directory read each instead of a stat per file)."""
+    files = {}
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                files[directory] = {entry.name for entry in entries}
+        except OSError:
+            files[directory] = set()
+    return files
+
 
 def extract_charts(
     pdfs: list[Path | str]
@@ -21,7 +112,15 @@ def extract_charts(
     """Extract EPS estimate chart pages from PDF files.
     
     Extracts the page containing "Bottom-Up EPS Estimates" chart from each PDF
-    and returns PNG image data in memory.
+    and returns PNG image data in memory. With more than one PDF, PDFs are
+    parsed and rendered in a process pool (one PDF per task); results are
+    returned in input order. A single PDF is extracted in this process, as are
+    all PDFs if the pool cannot start.
+    
+    Note:
+        On platforms that spawn worker processes (macOS, Windows), the pool
+        re-imports the calling script, so scripts calling this at module level
+        need an `if __name__ == '__main__':` guard to get the parallel path.
     
     Args:
         pdfs: List of PDF file paths (Path objects or strings)
@@ -34,63 +133,129 @@ def extract_charts(
     print(f"🔍 Extracting EPS charts from {len(pdfs)} PDFs")
     print("=" * 80)
     
-    for pdf_path in pdfs:
-        if isinstance(pdf_path, str):
-            pdf_path = Path(pdf_path)
-        
-        if not pdf_path.exists():
-            print(f"⚠️  Skipping {pdf_path.name}: File not found")
-            continue
-        
-        # Extract date from filename (EarningsInsight_20161209_120916.pdf -> 20161209)
-        try:
-            date_str = pdf_path.stem.split('_')[1]
-            report_date_dt = datetime.strptime(date_str, '%Y%m%d')
-            report_date = report_date_dt.strftime('%Y-%m-%d')
-        except (IndexError, ValueError):
-            print(f"⚠️  Skipping {pdf_path.name}: Cannot extract date from filename")
-            continue
-        
-        filename = f"{date_str}.png"
-        
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    text = page.extract_text()
-                    
-                    if text and any(kw in text for kw in KEYWORDS):
-                        # Check keyword location (if at bottom of page)
-                        keyword_at_bottom = False
-                        for word in page.extract_words():
-                            if any(kw.split()[0] in word['text'] for kw in KEYWORDS):
-                                if word['top'] > 700:
-                                    keyword_at_bottom = True
-                                    break
-                        
-                        # If keyword is at bottom, extract next page
-                        if keyword_at_bottom and page_num + 1 < len(pdf.pages):
-                            target_page = pdf.pages[page_num + 1]
-                            target_page_num = page_num + 2
-                        else:
-                            target_page = page
-                            target_page_num = page_num + 1
-                        
-                        # Get image bytes (save to BytesIO instead of disk)
-                        import io
-                        img = target_page.to_image(resolution=300)
-                        img_bytes = io.BytesIO()
-                        img.save(img_bytes, format='PNG')
-                        image_bytes = img_bytes.getvalue()
-                        
-                        print(f"✅ {report_date:12s} Page {target_page_num:2d} -> {filename}")
-                        extracted_files.append((filename, image_bytes))
-                        break
-                else:
-                    print(f"⚠️  {report_date}: No EPS chart page found")
-        
-        except Exception as e:
-            print(f"❌ {report_date}: Error - {str(e)[:50]}")
+    pdf_paths = [Path(pdf_path) for pdf_path in pdfs]
+    files_by_dir = _list_files({pdf_path.parent for pdf_path in pdf_paths})
+    existing = [pdf_path for pdf_path in pdf_paths if pdf_path.name in files_by_dir[pdf_path.parent]]
+    
+    results = _extract_all(existing)
+    try:
+        for pdf_path in pdf_paths:
+            if pdf_path.name not in files_by_dir[pdf_path.parent]:
+                print(f"⚠️  Skipping {pdf_path.name}: File not found")
+                continue
+            
+            message, extracted = next(results)
+            print(message)
+            if extracted:
+                extracted_files.append(extracted)
+    finally:
+        results.close()
     
     print(f"\n📊 Result: {len(extracted_files)} PNG files extracted")
     return extracted_files
 
+
+def _extract_all(pdf_paths: list[Path]) -> Iterator[tuple[str, tuple[str, bytes] | None]]:
+    """Extract PDFs in order, in a process pool when there is more than one.
+    
+    If the pool breaks before the first result (e.g. worker processes cannot
+    start), the PDFs are extracted in this process instead.
+    """
+    if len(pdf_paths) > 1:
+        done = 0
+        try:
+            max_workers = min(len(pdf_paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                try:
+                    for result in executor.map(_extract_one, pdf_paths):
+                        yield result
+                        done += 1
+                except GeneratorExit:
+                    # The caller stopped early: queued PDFs are not extracted
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+            return
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            if done:
+                raise
+            print(f"⚠️  Process pool unavailable ({e}), extracting in this process")
+    
+    for pdf_path in pdf_paths:
+        yield _extract_one(pdf_path)
+
+
+# Relative keyword page positions found so far in this process
+_keyword_positions: list[float] = []
+
+
+def _extract_one(pdf_path: Path) -> tuple[str, tuple[str, bytes] | None]:
+    """Extract the EPS chart page of a single PDF.
+    
+    The chart sits near the end of the reports, so pages are searched outward
+    from the average position of the charts found so far in this process
+    (starting from the last page).
+    
+    Args:
+        pdf_path: PDF file path (existing file)
+        
+    Returns:
+        Tuple of (status message, (filename, image_bytes) or None)
+    """
+    # Extract date from filename (EarningsInsight_20161209_120916.pdf -> 20161209)
+    try:
+        date_str = pdf_path.stem.split('_')[1]
+        report_date_dt = datetime.strptime(date_str, '%Y%m%d')
+        report_date = report_date_dt.strftime('%Y-%m-%d')
+    except (IndexError, ValueError):
+        return f"⚠️  Skipping {pdf_path.name}: Cannot extract date from filename", None
+    
+    filename = f"{date_str}.png"
+    
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            num_pages = len(pdf.pages)
+            position_hint = sum(_keyword_positions) / len(_keyword_positions) if _keyword_positions else 1.0
+            
+            search_order = _page_search_order(num_pages, position_hint)
+            
+            # Check the page found by the fast PDFium scan first (the remaining
+            # pages are still searched with pdfplumber if it is not confirmed)
+            keyword_page = _find_keyword_page(pdf_path, search_order)
+            if keyword_page is not None:
+                search_order = [keyword_page] + [p for p in search_order if p != keyword_page]
+            
+            for page_num in search_order:
+                page = pdf.pages[page_num]
+                text = page.extract_text()
+                
+                if text and KEYWORD_PATTERN.search(text):
+                    if num_pages > 1:
+                        _keyword_positions.append(page_num / (num_pages - 1))
+                    
+                    # Check keyword location (if at bottom of page)
+                    keyword_at_bottom = False
+                    for word in page.extract_words():
+                        if word['top'] > 700 and KEYWORD_PREFIX_PATTERN.search(word['text']):
+                            keyword_at_bottom = True
+                            break
+                    
+                    # If keyword is at bottom, extract next page
+                    if keyword_at_bottom and page_num + 1 < len(pdf.pages):
+                        target_page = pdf.pages[page_num + 1]
+                        target_page_num = page_num + 2
+                    else:
+                        target_page = page
+                        target_page_num = page_num + 1
+                    
+                    # Get image bytes (save to BytesIO instead of disk)
+                    img = target_page.to_image(resolution=CHART_RESOLUTION)
+                    img_bytes = io.BytesIO()
+                    img.save(img_bytes, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+                    image_bytes = img_bytes.getvalue()
+                    
+                    return f"✅ {report_date:12s} Page {target_page_num:2d} -> {filename}", (filename, image_bytes)
+            
+            return f"⚠️  {report_date}: No EPS chart page found", None
+    
+    except Exception as e:
+        return f"❌ {report_date}: Error - {str(e)[:50]}", None
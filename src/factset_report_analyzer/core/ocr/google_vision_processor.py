@@ -1,5 +1,6 @@
 """Module for image OCR processing using Google Cloud Vision API."""
 
+from functools import lru_cache
 from pathlib import Path
 import os
 import cv2
@@ -25,6 +26,12 @@ def get_google_vision_client():
     if not creds_path or not Path(creds_path).exists():
         raise ValueError(f"Google Cloud Vision authentication file not found: {creds_path}")
     
+    return _create_vision_client(creds_path)
+
+
+@lru_cache(maxsize=1)
+def _create_vision_client(creds_path: str):
+    """Create client once per key file (gRPC clients are thread-safe and reusable)."""
     credentials = service_account.Credentials.from_service_account_file(creds_path)
     return vision.ImageAnnotatorClient(credentials=credentials)
 
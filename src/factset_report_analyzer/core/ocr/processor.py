@@ -1,6 +1,7 @@
 """Main processor for extracting quarters and values from chart images."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -24,6 +25,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum concurrent process_image calls (dominated by Google Vision API latency)
+OCR_MAX_WORKERS = 8
+
+# Report_Date string format used in the CSV files
+REPORT_DATE_FORMAT = '%Y-%m-%d'
+
+
+def _to_datetime(dates: pd.Series) -> pd.Series:
+    """Parse a Report_Date column with the vectorized ISO 8601 parser.
+
+    Columns that are already datetime64 are returned as is.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates, format='ISO8601')
+
 
 def process_image(image_path: Path) -> list[dict]:
     """Extract quarter and EPS information from a single image.
@@ -99,7 +116,7 @@ def _load_existing_data() -> tuple[pd.DataFrame | None, pd.DataFrame | None, set
     
     if existing_df is not None and not existing_df.empty:
         existing_df = existing_df.drop(columns=['Confidence'], errors='ignore')
-        existing_df['Report_Date'] = pd.to_datetime(existing_df['Report_Date'])
+        existing_df['Report_Date'] = _to_datetime(existing_df['Report_Date'])
         processed_dates = set(existing_df['Report_Date'].dt.strftime('%Y%m%d'))
     
     return existing_df, existing_confidence_df, processed_dates
@@ -117,36 +134,33 @@ def _get_images_to_process(directory: Path, processed_dates: set[str], limit: in
 
 
 def _merge_data(current_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
-    """Merge new data with existing data."""
+    """Merge new data with existing data.
+    
+    Both inputs must already have datetime Report_Date columns (parsed by
+    _load_existing_data and convert_to_wide_format). They are passed to the
+    upsert as is, so the merged frame is built in a single concat without
+    copying either input first.
+    """
     if current_df.empty:
-        return new_df.copy()
+        return new_df
     
     if new_df.empty:
-        return current_df.copy()
-    
-    # Create copies to avoid modifying originals
-    current_copy = current_df.copy()
-    new_copy = new_df.copy()
-    
-    # Ensure Report_Date is datetime (both should already be datetime, but ensure consistency)
-    current_copy['Report_Date'] = pd.to_datetime(current_copy['Report_Date'])
-    new_copy['Report_Date'] = pd.to_datetime(new_copy['Report_Date'])
+        return current_df
     
     # Debug: log counts before merge
-    logger.debug(f"Merging: current={len(current_copy)} records, new={len(new_copy)} records")
+    logger.debug(f"Merging: current={len(current_df)} records, new={len(new_df)} records")
     
-    # Concat and deduplicate (keep='last' means new data overwrites old for same date)
-    result_df = pd.concat([current_copy, new_copy], ignore_index=True)\
-        .drop_duplicates(subset=['Report_Date'], keep='last')\
-        .sort_values('Report_Date')\
-        .reset_index(drop=True)
+    # Upsert by date (new data overwrites old for same date)
+    result_df = _upsert_by_date(current_df, new_df)
     
     # Debug: log count after merge
     logger.debug(f"After merge: {len(result_df)} records")
     
-    # Sort quarter columns
-    quarter_cols = sorted([c for c in result_df.columns if c != 'Report_Date'], key=_parse_quarter_for_sort)
-    return result_df[['Report_Date'] + quarter_cols]
+    # Sort quarter columns (only reorder when a new quarter changed the order)
+    columns = ['Report_Date'] + sorted([c for c in result_df.columns if c != 'Report_Date'], key=_parse_quarter_for_sort)
+    if list(result_df.columns) == columns:
+        return result_df
+    return result_df[columns]
 
 
 def process_directory(directory: Path, limit: int | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -175,44 +189,64 @@ def process_directory(directory: Path, limit: int | None = None) -> tuple[pd.Dat
     # Process images
     print(f"\n🔄 Processing {len(image_files)} new images...")
     
-    # Initialize current_df with existing data (deep copy to avoid modification)
+    # Initialize current_df with existing data (Report_Date is already datetime;
+    # _merge_data builds a new frame, so existing_df is not modified)
     if existing_df is not None and not existing_df.empty:
-        current_df = existing_df.copy(deep=True)
-        # Ensure Report_Date is datetime (should already be, but ensure consistency)
-        current_df['Report_Date'] = pd.to_datetime(current_df['Report_Date'])
+        current_df = existing_df
         print(f"📋 Loaded {len(current_df)} existing records")
-        logger.debug(f"Existing dates: {sorted(current_df['Report_Date'].dt.strftime('%Y-%m-%d').tolist()[:5])}...")
+        logger.debug(f"Existing dates: {sorted(current_df['Report_Date'].dt.strftime(REPORT_DATE_FORMAT).tolist()[:5])}...")
     else:
         current_df = pd.DataFrame()
         print("📋 No existing data found")
     
     all_long_results = []
+    # Rows per report date; a later image with the same date replaces earlier rows
+    results_by_date: dict[str, list[dict]] = {}
     
-    for idx, image_path in enumerate(image_files, 1):
-        print(f"[{idx}/{len(image_files)}] {image_path.name}", end=" ... ")
+    with ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS) as executor:
+        # OCR runs concurrently; results are collected in image order
+        futures = [executor.submit(process_image, image_path) for image_path in image_files]
         
         try:
-            results = process_image(image_path)
-            if not results:
-                print("⚠️  No data")
-                continue
-            
-            all_long_results.extend(results)
-            new_df = convert_to_wide_format(pd.DataFrame(results))
-            
-            # Debug: check before merge
-            before_count = len(current_df)
-            current_df = _merge_data(current_df, new_df)
-            after_count = len(current_df)
-            
-            if after_count < before_count:
-                logger.warning(f"Data loss detected: {before_count} -> {after_count} records")
-            
-            print("✅")
+            for idx, (image_path, future) in enumerate(zip(image_files, futures), 1):
+                print(f"[{idx}/{len(image_files)}] {image_path.name}", end=" ... ")
                 
-        except Exception as e:
-            print(f"❌ {e}")
-            logger.error(f"Error: {e}")
+                try:
+                    results = future.result()
+                    if not results:
+                        print("⚠️  No data")
+                        continue
+                    
+                    all_long_results.extend(results)
+                    image_results_by_date: dict[str, list[dict]] = {}
+                    for result in results:
+                        image_results_by_date.setdefault(result['report_date'], []).append(result)
+                    results_by_date.update(image_results_by_date)
+                    
+                    print("✅")
+                        
+                except Exception as e:
+                    print(f"❌ {e}")
+                    logger.error(f"Error: {e}")
+        except BaseException:
+            # Interrupts stop the run: queued images are not sent to the (billed) API
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    
+    # Build the wide rows once and merge them in a single pass
+    if results_by_date:
+        new_rows = [result for date_results in results_by_date.values() for result in date_results]
+        new_df = convert_to_wide_format(pd.DataFrame.from_records(new_rows))
+        # Quarters missing for a date stay NaN, as in the existing data
+        new_df = new_df.where(new_df != '')
+        
+        # Debug: check before merge
+        before_count = len(current_df)
+        current_df = _merge_data(current_df, new_df)
+        after_count = len(current_df)
+        
+        if after_count < before_count:
+            logger.warning(f"Data loss detected: {before_count} -> {after_count} records")
     
     print(f"\n📊 Complete: {len(current_df)} total records (existing: {len(existing_df) if existing_df is not None and not existing_df.empty else 0}, new: {len(image_files)})\n")
     
@@ -220,10 +254,10 @@ def process_directory(directory: Path, limit: int | None = None) -> tuple[pd.Dat
     if current_df.empty and (existing_df is not None and not existing_df.empty):
         # Format existing data before returning
         existing_df_formatted = existing_df.copy()
-        existing_df_formatted['Report_Date'] = pd.to_datetime(existing_df_formatted['Report_Date']).dt.strftime('%Y-%m-%d')
+        existing_df_formatted['Report_Date'] = _to_datetime(existing_df_formatted['Report_Date']).dt.strftime(REPORT_DATE_FORMAT)
         existing_confidence_formatted = existing_confidence_df.copy() if existing_confidence_df is not None and not existing_confidence_df.empty else pd.DataFrame(columns=['Report_Date'])
         if not existing_confidence_formatted.empty:
-            existing_confidence_formatted['Report_Date'] = pd.to_datetime(existing_confidence_formatted['Report_Date']).dt.strftime('%Y-%m-%d')
+            existing_confidence_formatted['Report_Date'] = _to_datetime(existing_confidence_formatted['Report_Date']).dt.strftime(REPORT_DATE_FORMAT)
         return existing_df_formatted, existing_confidence_formatted
     
     if current_df.empty:
@@ -238,9 +272,9 @@ def process_directory(directory: Path, limit: int | None = None) -> tuple[pd.Dat
     
     # Format dates (ensure all dates are formatted consistently)
     if not current_df.empty:
-        current_df['Report_Date'] = pd.to_datetime(current_df['Report_Date']).dt.strftime('%Y-%m-%d')
+        current_df['Report_Date'] = _to_datetime(current_df['Report_Date']).dt.strftime(REPORT_DATE_FORMAT)
     if not confidence_df.empty:
-        confidence_df['Report_Date'] = pd.to_datetime(confidence_df['Report_Date']).dt.strftime('%Y-%m-%d')
+        confidence_df['Report_Date'] = _to_datetime(confidence_df['Report_Date']).dt.strftime(REPORT_DATE_FORMAT)
     
     return current_df, confidence_df
 
@@ -253,16 +287,16 @@ def _calculate_new_confidence(all_long_results: list, current_df: pd.DataFrame)
     df_long = pd.DataFrame(all_long_results)
     
     # Normalize report_date to datetime
-    df_long['report_date'] = pd.to_datetime(df_long['report_date'])
-    new_dates = set(df_long['report_date'].dt.strftime('%Y-%m-%d'))
+    df_long['report_date'] = _to_datetime(df_long['report_date'])
+    new_dates = set(df_long['report_date'].dt.strftime(REPORT_DATE_FORMAT))
     
     # Create copy to avoid modifying original
     df_copy = current_df.copy()
-    df_copy['Report_Date'] = pd.to_datetime(df_copy['Report_Date'])
-    new_df_wide = df_copy[df_copy['Report_Date'].dt.strftime('%Y-%m-%d').isin(new_dates)].copy()
+    df_copy['Report_Date'] = _to_datetime(df_copy['Report_Date'])
+    new_df_wide = df_copy[df_copy['Report_Date'].dt.strftime(REPORT_DATE_FORMAT).isin(new_dates)].copy()
     
     if new_df_wide.empty:
-        logger.warning(f"No matching dates found. new_dates: {new_dates}, current_df dates: {df_copy['Report_Date'].dt.strftime('%Y-%m-%d').tolist()}")
+        logger.warning(f"No matching dates found. new_dates: {new_dates}, current_df dates: {df_copy['Report_Date'].dt.strftime(REPORT_DATE_FORMAT).tolist()}")
         return None
     
     return calculate_confidence_dataframe(new_df_wide, df_long, df_copy)
@@ -276,13 +310,26 @@ def _merge_confidence(existing: pd.DataFrame | None, new: pd.DataFrame | None) -
     if new is None or new.empty:
         return existing.copy()
     
-    existing['Report_Date'] = pd.to_datetime(existing['Report_Date'])
-    new['Report_Date'] = pd.to_datetime(new['Report_Date'])
+    existing['Report_Date'] = _to_datetime(existing['Report_Date'])
+    new['Report_Date'] = _to_datetime(new['Report_Date'])
+    
+    return _upsert_by_date(existing, new)
+
+
+def _upsert_by_date(current: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Upsert rows of new into current by Report_Date (new rows win on same date).
+    
+    Both DataFrames are expected to have datetime Report_Date columns and current
+    to be sorted by date. Rows are only re-sorted when a new date falls before
+    an existing one; appending later dates keeps the order without sorting.
+    """
+    new = new[~new['Report_Date'].duplicated(keep='last')]
+    kept = current[~current['Report_Date'].isin(new['Report_Date'])]
     
-    return pd.concat([existing, new], ignore_index=True)\
-        .drop_duplicates(subset=['Report_Date'], keep='last')\
-        .sort_values('Report_Date')\
-        .reset_index(drop=True)
+    result_df = pd.concat([kept, new], ignore_index=True)
+    if not result_df['Report_Date'].is_monotonic_increasing:
+        result_df = result_df.sort_values('Report_Date', ignore_index=True)
+    return result_df
 
 
 def convert_to_wide_format(df: pd.DataFrame) -> pd.DataFrame:
@@ -324,7 +371,7 @@ def convert_to_wide_format(df: pd.DataFrame) -> pd.DataFrame:
     df_pivot = df_pivot.rename(columns={'report_date': 'Report_Date'})
     
     # Ensure Report_Date is datetime (for consistent merging)
-    df_pivot['Report_Date'] = pd.to_datetime(df_pivot['Report_Date'])
+    df_pivot['Report_Date'] = _to_datetime(df_pivot['Report_Date'])
     
     # Sort quarter columns (Q1'14, Q2'14, ... order)
     quarter_columns = sorted(
@@ -350,12 +397,12 @@ def calculate_confidence_dataframe(
     consistency_df = full_df_wide if full_df_wide is not None else df_wide
     
     # Ensure Report_Date is datetime for comparison
-    consistency_df['Report_Date'] = pd.to_datetime(consistency_df['Report_Date'])
+    consistency_df['Report_Date'] = _to_datetime(consistency_df['Report_Date'])
     first_date = sorted(consistency_df['Report_Date'].unique())[0] if len(consistency_df) > 0 else None
     
     # Normalize df_long report_date to datetime for comparison
     df_long = df_long.copy()
-    df_long['report_date'] = pd.to_datetime(df_long['report_date'])
+    df_long['report_date'] = _to_datetime(df_long['report_date'])
     
     results = []
     for report_date in df_wide['Report_Date']:
@@ -396,7 +443,7 @@ def calculate_consistency_with_previous_week_wide(
     """Calculate consistency with previous week (actuals only)."""
     try:
         current_dt = pd.to_datetime(current_date)
-        full_df_wide['Report_Date'] = pd.to_datetime(full_df_wide['Report_Date'])
+        full_df_wide['Report_Date'] = _to_datetime(full_df_wide['Report_Date'])
         
         previous_dates = full_df_wide[full_df_wide['Report_Date'] < current_dt]['Report_Date']
         if len(previous_dates) == 0:
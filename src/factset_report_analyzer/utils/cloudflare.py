@@ -2,6 +2,9 @@
 
 import io
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,6 +17,11 @@ except ImportError:
     boto3 = None  # type: ignore[assignment]
     Config = None  # type: ignore[assignment]
 
+try:
+    import pyarrow  # type: ignore[import-untyped]  # noqa: F401  (pandas Parquet engine)
+except ImportError:
+    pyarrow = None  # type: ignore[assignment]
+
 load_dotenv()
 
 # R2 credentials
@@ -35,9 +43,29 @@ _disabled = os.getenv('CLOUD_STORAGE_ENABLED', '').lower() == 'false'
 CLOUD_STORAGE_ENABLED = (_is_ci or _enabled) and _has_creds and not _disabled
 PUBLIC_BUCKET_ENABLED = CLOUD_STORAGE_ENABLED and bool(R2_PUBLIC_BUCKET_NAME)
 
+# Compression of the Parquet snapshots written next to CSVs
+PARQUET_COMPRESSION = 'zstd'
+
+# Format of the last report date stored in the .last sidecar next to CSVs
+LAST_DATE_FORMAT = '%Y-%m-%d'
+
+# Public URL responses and parsed DataFrames by cloud path, keyed by ETag
+# (unchanged files are revalidated with a conditional GET instead of re-downloaded)
+_public_url_cache: dict[str, tuple[str, bytes]] = {}
+_dataframe_cache: dict[str, tuple[str, pd.DataFrame]] = {}
+
+# Keys in the public bucket, listed once on first existence check (None = not listed)
+_public_listing: set[str] | None = None
+_public_listing_lock = threading.Lock()
+
+# Shared S3 client (client creation is not thread-safe, the client itself is)
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
 
 def _get_s3_client():
     """Get S3 client for R2."""
+    global _s3_client
     if not CLOUD_STORAGE_ENABLED:
         print(f"CLOUD_STORAGE_ENABLED is False")
         return None
@@ -45,17 +73,20 @@ def _get_s3_client():
         print(f"boto3 or Config not available: boto3={boto3}, Config={Config}")
         return None
     
-    try:
-        return boto3.client(
-            's3',
-            endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
-            aws_access_key_id=R2_ACCESS_KEY_ID,
-            aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version='s3v4')
-        )
-    except Exception as e:
-        print(f"Error creating S3 client: {e}")
-        return None
+    with _s3_client_lock:
+        if _s3_client is None:
+            try:
+                _s3_client = boto3.client(
+                    's3',
+                    endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
+                    aws_access_key_id=R2_ACCESS_KEY_ID,
+                    aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+                    config=Config(signature_version='s3v4')
+                )
+            except Exception as e:
+                print(f"Error creating S3 client: {e}")
+                return None
+        return _s3_client
 
 
 def upload_to_cloud(file_path: Path, cloud_path: str | None = None) -> bool:
@@ -107,44 +138,351 @@ def download_from_cloud(cloud_path: str, local_path: Path) -> bool:
         return False
 
 
+def _get_parquet_path(cloud_path: str) -> str:
+    """Get cloud path of the Parquet snapshot stored next to a CSV."""
+    return f"{cloud_path.removesuffix('.csv')}.parquet"
+
+
+def _get_last_date_path(cloud_path: str) -> str:
+    """Get cloud path of the last-date sidecar stored next to a CSV."""
+    return f"{cloud_path.removesuffix('.csv')}.last"
+
+
+def _read_from_public_url(cloud_path: str) -> tuple[bytes, str | None] | None:
+    """Read raw file content and ETag from public URL (no auth needed).
+    
+    A previously read file is revalidated with If-None-Match; on 304 Not Modified
+    the cached content is returned without downloading it again.
+    """
+    import urllib.error
+    import urllib.request
+    
+    url = f"{R2_PUBLIC_URL}/{cloud_path}"
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    cached = _public_url_cache.get(cloud_path)
+    if cached:
+        headers['If-None-Match'] = cached[0]
+    
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=10) as response:
+            content = response.read()
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached:
+            return cached[1], cached[0]
+        return None
+    except Exception:
+        return None
+    
+    if etag:
+        _public_url_cache[cloud_path] = (etag, content)
+    return content, etag
+
+
+def _read_dataframe_from_public_url(cloud_path: str, parse) -> pd.DataFrame | None:
+    """Read and parse a file from public URL, reusing the parsed DataFrame while its ETag is unchanged."""
+    result = _read_from_public_url(cloud_path)
+    if result is None:
+        return None
+    content, etag = result
+    
+    cached = _dataframe_cache.get(cloud_path)
+    if etag and cached and cached[0] == etag:
+        return cached[1].copy()
+    
+    try:
+        df = parse(io.BytesIO(content))
+    except Exception:
+        return None
+    
+    if etag:
+        _dataframe_cache[cloud_path] = (etag, df.copy())
+    return df
+
+
+def _invalidate_public_url_cache(cloud_path: str) -> None:
+    """Drop cached content of a public file after it was written."""
+    _public_url_cache.pop(cloud_path, None)
+    _dataframe_cache.pop(cloud_path, None)
+
+
+def _get_public_listing() -> set[str] | None:
+    """Get all keys in the public bucket (listed with a single paginated call per process)."""
+    global _public_listing
+    if not PUBLIC_BUCKET_ENABLED:
+        return None
+    
+    s3_client = _get_s3_client()
+    if not s3_client:
+        return None
+    
+    with _public_listing_lock:
+        if _public_listing is None:
+            try:
+                keys = set()
+                paginator = s3_client.get_paginator('list_objects_v2')
+                for page in paginator.paginate(Bucket=R2_PUBLIC_BUCKET_NAME):
+                    keys.update(obj['Key'] for obj in page.get('Contents', []))
+                _public_listing = keys
+            except Exception:
+                return None
+        return _public_listing
+
+
+def _add_to_public_listing(cloud_path: str) -> None:
+    """Record a key written to the public bucket in the listing (if listed)."""
+    with _public_listing_lock:
+        if _public_listing is not None:
+            _public_listing.add(cloud_path)
+
+
+def _delete_public_object(s3_client, cloud_path: str) -> bool:
+    """Delete a key from the public bucket (never raises exceptions)."""
+    try:
+        s3_client.delete_object(Bucket=R2_PUBLIC_BUCKET_NAME, Key=cloud_path)
+    except Exception:
+        return False
+    finally:
+        _invalidate_public_url_cache(cloud_path)
+    
+    with _public_listing_lock:
+        if _public_listing is not None:
+            _public_listing.discard(cloud_path)
+    return True
+
+
+def public_file_exists(cloud_path: str) -> bool:
+    """Check if file exists in the public bucket.
+    
+    Uses the cached bucket listing when credentials are available, otherwise a
+    HEAD request to the public URL (no content is downloaded).
+    """
+    import urllib.request
+    
+    listing = _get_public_listing()
+    if listing is not None:
+        return cloud_path in listing
+    
+    try:
+        url = f"{R2_PUBLIC_URL}/{cloud_path}"
+        req = urllib.request.Request(url, method='HEAD', headers={'User-Agent': 'Mozilla/5.0'})
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def _read_parquet(buffer) -> pd.DataFrame:
+    """Read a Parquet snapshot the way pd.read_csv reads the CSV it was built from.
+    
+    Nulls in object columns come back as None from Parquet; they are turned
+    back into NaN so cell values match the CSV (e.g. str() gives 'nan').
+    """
+    df = pd.read_parquet(buffer)
+    return df.where(df.notna())
+
+
 def read_csv_from_cloud(cloud_path: str) -> pd.DataFrame | None:
-    """Read CSV from public URL (no auth needed)."""
+    """Read CSV from public URL (no auth needed).
+    
+    If pyarrow is available, the Parquet snapshot written by write_csv_to_cloud is
+    read instead of the CSV (same contents, binary columnar format). The CSV is
+    used when no snapshot exists. Files that were read before are only downloaded
+    and parsed again if their ETag changed.
+    """
+    if pyarrow and cloud_path.endswith('.csv'):
+        df = _read_dataframe_from_public_url(_get_parquet_path(cloud_path), _read_parquet)
+        if df is not None:
+            return df
+    
+    return _read_dataframe_from_public_url(cloud_path, pd.read_csv)
+
+
+def _read_range_from_public_url(cloud_path: str, byte_range: str) -> tuple[bytes, int] | None:
+    """Read part of a file from public URL with an HTTP Range request.
+    
+    Args:
+        cloud_path: Cloud storage path
+        byte_range: Range header value (e.g. 'bytes=-8192')
+        
+    Returns:
+        Tuple of (content, offset of content in the file), or None on failure.
+        The offset is 0 if the server ignored the range and sent the whole file.
+    """
     import urllib.request
     
     try:
         url = f"{R2_PUBLIC_URL}/{cloud_path}"
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0', 'Range': byte_range})
         with urllib.request.urlopen(req, timeout=10) as response:
-            return pd.read_csv(io.BytesIO(response.read()))
+            content = response.read()
+            if response.status != 206:
+                return content, 0
+            # Content-Range: bytes <start>-<end>/<size>
+            start = int(response.headers['Content-Range'].split()[1].split('-')[0])
+            return content, start
+    except Exception:
+        return None
+
+
+def read_csv_tail_from_cloud(cloud_path: str, tail_bytes: int = 8192, **read_csv_kwargs) -> pd.DataFrame | None:
+    """Read the header and the last rows of a CSV from public URL (no auth needed).
+    
+    Only the last tail_bytes of the file (plus its first line) are downloaded.
+    
+    Args:
+        cloud_path: Cloud storage path of the CSV
+        tail_bytes: Number of bytes to read from the end of the file
+        **read_csv_kwargs: Passed to pd.read_csv (e.g. usecols)
+        
+    Returns:
+        DataFrame of the complete rows in the tail, or None on failure
+    """
+    tail = _read_range_from_public_url(cloud_path, f'bytes=-{tail_bytes}')
+    if tail is None:
+        return None
+    content, start = tail
+    
+    if start > 0:
+        head = _read_range_from_public_url(cloud_path, 'bytes=0-4095')
+        if head is None:
+            return None
+        header, found, _ = head[0].partition(b'\n')
+        if not found:
+            return None
+        # The first line of the tail may be cut off
+        content = header + b'\n' + content.partition(b'\n')[2]
+    
+    try:
+        return pd.read_csv(io.BytesIO(content), **read_csv_kwargs)
     except Exception:
         return None
 
 
 def write_csv_to_cloud(df: pd.DataFrame, cloud_path: str) -> bool:
-    """Write CSV to public bucket (requires auth)."""
+    """Write CSV to public bucket (requires auth).
+    
+    If pyarrow is available, a Parquet snapshot of the CSV contents is uploaded
+    concurrently with the CSV. The snapshot never outlives a mismatching CSV:
+    if only the snapshot upload fails, the old snapshot is deleted so readers
+    preferring it fall back to the new CSV; if the CSV upload fails, the new
+    snapshot is deleted so readers fall back to the old CSV.
+    
+    After the CSV is written, the last Report_Date is stored in a small `.last`
+    sidecar (see read_last_date_from_cloud). If it cannot be stored, the old
+    sidecar is deleted so it never describes an older CSV.
+    """
     if not PUBLIC_BUCKET_ENABLED or not boto3 or not Config:
         return False
     
+    s3_client = _get_s3_client()
+    if not s3_client:
+        return False
+    
     try:
-        s3_client = boto3.client(
-            's3',
-            endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
-            aws_access_key_id=R2_ACCESS_KEY_ID,
-            aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version='s3v4')
-        )
+        csv_bytes = df.to_csv(index=False).encode('utf-8')
         
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        s3_client.put_object(
-            Bucket=R2_PUBLIC_BUCKET_NAME,
-            Key=cloud_path,
-            Body=csv_buffer.getvalue().encode('utf-8'),
-            ContentType='text/csv'
-        )
+        if not (pyarrow and cloud_path.endswith('.csv')):
+            s3_client.put_object(
+                Bucket=R2_PUBLIC_BUCKET_NAME,
+                Key=cloud_path,
+                Body=csv_bytes,
+                ContentType='text/csv'
+            )
+            _add_to_public_listing(cloud_path)
+            if cloud_path.endswith('.csv'):
+                _put_last_date(s3_client, df, cloud_path)
+            return True
+        
+        parquet_path = _get_parquet_path(cloud_path)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # The CSV upload starts right away; the snapshot is encoded and uploaded alongside it
+            csv_future = executor.submit(
+                s3_client.put_object,
+                Bucket=R2_PUBLIC_BUCKET_NAME,
+                Key=cloud_path,
+                Body=csv_bytes,
+                ContentType='text/csv'
+            )
+            parquet_future = executor.submit(_put_parquet_snapshot, s3_client, csv_bytes, parquet_path)
+            csv_written = csv_future.exception() is None
+            parquet_written = parquet_future.exception() is None
+        
+        if not csv_written:
+            # A new snapshot next to the old CSV would serve data of a failed write
+            if parquet_written:
+                _delete_public_object(s3_client, parquet_path)
+            return False
+        
+        _add_to_public_listing(cloud_path)
+        if parquet_written:
+            _add_to_public_listing(parquet_path)
+        else:
+            # A stale snapshot would hide the new CSV from readers
+            _delete_public_object(s3_client, parquet_path)
+        
+        _put_last_date(s3_client, df, cloud_path)
         return True
     except Exception:
         return False
+    finally:
+        _invalidate_public_url_cache(cloud_path)
+        _invalidate_public_url_cache(_get_parquet_path(cloud_path))
+
+
+def _put_parquet_snapshot(s3_client, csv_bytes: bytes, parquet_path: str) -> None:
+    """Encode CSV contents as a Parquet snapshot and upload it to the public bucket."""
+    # Snapshot is built from the CSV text so both formats read back identically
+    parquet_buffer = io.BytesIO()
+    pd.read_csv(io.BytesIO(csv_bytes)).to_parquet(parquet_buffer, index=False, compression=PARQUET_COMPRESSION)
+    s3_client.put_object(
+        Bucket=R2_PUBLIC_BUCKET_NAME,
+        Key=parquet_path,
+        Body=parquet_buffer.getvalue(),
+        ContentType='application/vnd.apache.parquet'
+    )
+
+
+def _put_last_date(s3_client, df: pd.DataFrame, cloud_path: str) -> None:
+    """Store the last Report_Date of a written CSV in its `.last` sidecar.
+    
+    The old sidecar is deleted if the date cannot be parsed or uploaded.
+    """
+    last_date_path = _get_last_date_path(cloud_path)
+    try:
+        if 'Report_Date' in df.columns and not df.empty:
+            last_date = pd.to_datetime(df['Report_Date'], format='ISO8601').max()
+            if pd.notna(last_date):
+                s3_client.put_object(
+                    Bucket=R2_PUBLIC_BUCKET_NAME,
+                    Key=last_date_path,
+                    Body=last_date.strftime(LAST_DATE_FORMAT).encode('utf-8'),
+                    ContentType='text/plain'
+                )
+                _add_to_public_listing(last_date_path)
+                return
+    except Exception:
+        pass
+    finally:
+        _invalidate_public_url_cache(last_date_path)
+    
+    _delete_public_object(s3_client, last_date_path)
+
+
+def read_last_date_from_cloud(cloud_path: str) -> datetime | None:
+    """Read the last Report_Date stored next to a CSV by write_csv_to_cloud (no auth needed).
+    
+    Returns:
+        Last report date, or None if there is no readable sidecar
+    """
+    result = _read_from_public_url(_get_last_date_path(cloud_path))
+    if result is None:
+        return None
+    try:
+        return datetime.strptime(result[0].decode('utf-8').strip(), LAST_DATE_FORMAT)
+    except (UnicodeDecodeError, ValueError):
+        return None
 
 
 def file_exists_in_cloud(cloud_path: str) -> bool:
@@ -170,6 +508,9 @@ def file_exists_in_cloud(cloud_path: str) -> bool:
 def upload_file_to_public_cloud(file_path: Path, cloud_path: str) -> bool:
     """Upload file to public bucket (requires auth).
     
+    Uploading a `.csv` also rewrites its Parquet snapshot and `.last` sidecar
+    (see write_csv_to_cloud), so readers never get them for an older CSV.
+    
     Args:
         file_path: Local file path
         cloud_path: Cloud storage path
@@ -183,15 +524,11 @@ def upload_file_to_public_cloud(file_path: Path, cloud_path: str) -> bool:
     if not file_path.exists():
         return False
     
+    s3_client = _get_s3_client()
+    if not s3_client:
+        return False
+    
     try:
-        s3_client = boto3.client(
-            's3',
-            endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
-            aws_access_key_id=R2_ACCESS_KEY_ID,
-            aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version='s3v4')
-        )
-        
         # Determine content type based on file extension
         content_type = 'application/octet-stream'
         if file_path.suffix.lower() == '.png':
@@ -207,12 +544,45 @@ def upload_file_to_public_cloud(file_path: Path, cloud_path: str) -> bool:
             cloud_path,
             ExtraArgs={'ContentType': content_type}
         )
+        _add_to_public_listing(cloud_path)
+        _invalidate_public_url_cache(cloud_path)
+        if cloud_path.endswith('.csv'):
+            _refresh_csv_companions(s3_client, file_path, cloud_path)
         return True
     except Exception as e:
         print(f"Error uploading file to public cloud: {e}")
         return False
 
 
+def _refresh_csv_companions(s3_client, file_path: Path, cloud_path: str) -> None:
+    """Rewrite the Parquet snapshot and `.last` sidecar of a CSV uploaded from a file.
+    
+    A companion that cannot be rewritten is deleted instead.
+    """
+    parquet_path = _get_parquet_path(cloud_path)
+    df = pd.DataFrame()
+    parquet_written = False
+    try:
+        csv_bytes = file_path.read_bytes()
+        df = pd.read_csv(io.BytesIO(csv_bytes))
+        if pyarrow:
+            _put_parquet_snapshot(s3_client, csv_bytes, parquet_path)
+            parquet_written = True
+    except Exception:
+        pass
+    finally:
+        _invalidate_public_url_cache(parquet_path)
+    
+    if parquet_written:
+        _add_to_public_listing(parquet_path)
+    else:
+        # A stale snapshot would hide the uploaded CSV from readers
+        _delete_public_object(s3_client, parquet_path)
+    
+    # Deletes the old sidecar if no Report_Date could be read
+    _put_last_date(s3_client, df, cloud_path)
+
+
 def list_cloud_files(prefix: str = '') -> list[str]:
     """List files in Cloudflare R2 bucket with given prefix.
     
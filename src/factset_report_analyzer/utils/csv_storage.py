@@ -5,12 +5,20 @@ from pathlib import Path
 
 import pandas as pd
 
-from .cloudflare import read_csv_from_cloud, write_csv_to_cloud
+from .cloudflare import (
+    public_file_exists,
+    read_csv_from_cloud,
+    read_csv_tail_from_cloud,
+    read_last_date_from_cloud,
+    write_csv_to_cloud,
+)
 
 
 def read_csv(cloud_path: str | None, local_path: Path) -> pd.DataFrame | None:
     """Read CSV from public URL.
     
+    The Parquet snapshot next to the CSV is read instead when available.
+    
     Args:
         cloud_path: Cloud file name (if None, uses local_path.name)
         local_path: Not used (kept for compatibility)
@@ -22,6 +30,11 @@ def read_csv(cloud_path: str | None, local_path: Path) -> pd.DataFrame | None:
 def write_csv(df: pd.DataFrame, cloud_path: str | None, local_path: Path) -> bool:
     """Write CSV to public bucket.
     
+    A zstd-compressed Parquet snapshot is written next to the CSV (the CSV is
+    kept for compatibility with external readers). write_csv_to_cloud also
+    stores the last Report_Date in a small `.last` sidecar for
+    get_last_date_from_csv.
+    
     Args:
         df: DataFrame to write
         cloud_path: Cloud file name (if None, uses local_path.name)
@@ -32,21 +45,33 @@ def write_csv(df: pd.DataFrame, cloud_path: str | None, local_path: Path) -> boo
 
 
 def get_last_date_from_csv(cloud_path: str | None, local_path: Path) -> datetime | None:
-    """Get last report date from CSV."""
-    df = read_csv(cloud_path, local_path)
+    """Get last report date from CSV.
+    
+    The `.last` sidecar written by write_csv_to_cloud is read first. Without it,
+    rows are stored sorted by Report_Date, so only the end of the file is
+    downloaded; the whole CSV is read if the tail cannot be used.
+    """
+    cloud_key = cloud_path or local_path.name
+    
+    last_date = read_last_date_from_cloud(cloud_key)
+    if last_date is not None:
+        return last_date
+    
+    df = read_csv_tail_from_cloud(cloud_key, usecols=['Report_Date'])
+    if df is None or df.empty:
+        df = read_csv_from_cloud(cloud_key)
     if df is None or df.empty or 'Report_Date' not in df.columns:
         return None
     
     try:
-        df['Report_Date'] = pd.to_datetime(df['Report_Date'])
-        last_date = df['Report_Date'].max()
+        last_date = pd.to_datetime(df['Report_Date'], format='ISO8601').max()
         return last_date.to_pydatetime() if pd.notna(last_date) else None
     except Exception:
         return None
 
 
 def csv_exists(cloud_path: str | None, local_path: Path) -> bool:
-    """Check if CSV exists in public URL."""
+    """Check if CSV exists in public URL (without downloading it)."""
     cloud_key = cloud_path or local_path.name
-    return read_csv_from_cloud(cloud_key) is not None
+    return public_file_exists(cloud_key)
 